@@ -0,0 +1,33 @@
+"""Aggregates behind the Analytics & Insights page.
+
+Each chart needs only a handful of rows, so the grouping and joining happen
+in SQLite and pandas only ever sees the rows that get plotted.
+"""
+import pandas as pd
+
+MEAL_TYPE_CLAIMS = """
+    SELECT IFNULL(f.Meal_Type, 'Unknown') AS Meal_Type, COUNT(*) AS Claims
+    FROM claims c
+    JOIN food_listings f ON c.Food_ID = f.Food_ID
+    GROUP BY 1
+    ORDER BY Claims DESC
+"""
+
+TOP_PROVIDERS = """
+    SELECT s.Provider_ID, IFNULL(p.Name, 'Unknown') AS Name, s.Total_Quantity AS Quantity
+    FROM summary_provider s
+    LEFT JOIN providers p ON p.Provider_ID = s.Provider_ID
+    ORDER BY s.Total_Quantity DESC
+    LIMIT ?
+"""
+
+
+def meal_type_claims(conn):
+    """Number of claims per meal type of the claimed listing."""
+    return pd.read_sql_query(MEAL_TYPE_CLAIMS, conn, dtype={"Meal_Type": "string", "Claims": "int64"})
+
+
+def top_providers(conn, limit=10):
+    """Providers with the largest total listed quantity."""
+    return pd.read_sql_query(TOP_PROVIDERS, conn, params=[limit],
+                             dtype={"Provider_ID": "int64", "Name": "string", "Quantity": "int64"})
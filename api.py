@@ -0,0 +1,330 @@
+"""Read-only HTTP JSON API over food_data.db.
+
+    python api.py --db food_data.db --port 8502
+
+A plain WSGI application (standard library only) serving the same data as
+the dashboard:
+
+    GET /health                          status and table versions
+    GET /reports                         the canned reports
+    GET /reports/<n>                     rows of report n (1-24)
+    GET /tables/<table>?page=&page_size=&q=&<column>=<value>
+                                         one page of a table, filtered as on
+                                         the Filter & Search page; q is a
+                                         full-text search
+    GET /options/<table>/<column>        sorted option list of a filter column
+
+Add ?format=ndjson (or send Accept: application/x-ndjson) to stream rows
+one JSON object per line, or ?format=csv / ?format=parquet to download
+them as a file. These stream straight from the cursor (see export.py); for
+/tables they cover every matching row instead of one page.
+
+Responses carry a weak ETag derived from the versions of the tables they
+read. A matching If-None-Match gets a 304 without touching the data. Bodies
+are gzip-compressed for clients that accept it. Each server thread reads
+through its own read-only connection.
+
+`Client(make_app(...))` calls the application in-process, without a socket.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import math
+import sqlite3
+import sys
+from datetime import date
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlencode
+from wsgiref.simple_server import WSGIServer, make_server
+from wsgiref.util import setup_testing_defaults
+
+from db import DB_PATH, ReaderPool
+import export
+from filters import build_where, count_rows, fetch_page, option_values, parse_id
+from migrations import migrate
+from reports import DATED_REPORTS, REPORT_IDS, REPORT_TABLES, ReportCache
+import search
+import versions
+
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 50
+GZIP_MIN_BYTES = 512
+NDJSON = "application/x-ndjson"
+
+# table -> (primary key, columns that can be filtered with ?column=value)
+API_TABLES = {
+    "providers": ("Provider_ID", ("Provider_ID", "Type", "City")),
+    "receivers": ("Receiver_ID", ("Receiver_ID", "Type", "City")),
+    "food_listings": ("Food_ID", ("Provider_ID", "Location", "Provider_Type", "Food_Type", "Meal_Type")),
+    "claims": ("Claim_ID", ("Food_ID", "Receiver_ID", "Status")),
+}
+
+STATUS_TEXT = {200: "200 OK", 304: "304 Not Modified", 400: "400 Bad Request",
+               404: "404 Not Found", 405: "405 Method Not Allowed", 500: "500 Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_value(value):
+    if hasattr(value, "item"):  # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def records(df):
+    """DataFrame -> list of JSON-ready dicts (NaN becomes null)."""
+    columns = list(df.columns)
+    return [dict(zip(columns, map(_json_value, row))) for row in df.itertuples(index=False, name=None)]
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_value)
+
+
+def _etag(path, query, table_versions):
+    key = _dumps([path, sorted(query.items()), table_versions])
+    return 'W/"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+class Api:
+    """The WSGI application; one instance serves every thread."""
+
+    def __init__(self, pool, report_cache=None, cache=None):
+        self.pool = pool
+        self.reports = report_cache or ReportCache()
+        self.cache = cache or versions.VersionedCache()
+
+    # -- request plumbing ---------------------------------------------------
+
+    def __call__(self, environ, start_response):
+        try:
+            if environ["REQUEST_METHOD"] not in ("GET", "HEAD"):
+                raise ApiError(405, "only GET is supported")
+            query = {k: v[-1] for k, v in parse_qs(environ.get("QUERY_STRING", "")).items()}
+            status, headers, body = self.route(environ, environ.get("PATH_INFO", "/"), query)
+        except ApiError as e:
+            status, headers, body = e.status, {}, _dumps({"error": str(e)}).encode()
+            headers["Content-Type"] = "application/json"
+        except sqlite3.Error as e:
+            status, headers, body = 500, {"Content-Type": "application/json"}, _dumps({"error": str(e)}).encode()
+
+        headers.setdefault("Vary", "Accept, Accept-Encoding")
+        gzip_ok = "gzip" in environ.get("HTTP_ACCEPT_ENCODING", "")
+        if isinstance(body, bytes):
+            if gzip_ok and len(body) >= GZIP_MIN_BYTES:
+                body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(body))
+            body = [body]
+        elif gzip_ok and headers["Content-Type"] != export.FORMATS["parquet"][0]:
+            body = export.gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+        start_response(STATUS_TEXT[status], list(headers.items()))
+        return [] if environ["REQUEST_METHOD"] == "HEAD" else body
+
+    def route(self, environ, path, query):
+        parts = [p for p in path.split("/") if p]
+        conn = self.pool.reader()
+        fmt = query.pop("format", None) or ("ndjson" if NDJSON in environ.get("HTTP_ACCEPT", "") else "json")
+        if fmt != "json" and fmt not in export.FORMATS:
+            raise ApiError(400, f"unknown format {fmt!r}; use json, {', '.join(export.FORMATS)}")
+        if parts == ["health"]:
+            return self.respond(environ, {"status": "ok", "versions": versions.current(conn)})
+        if parts == ["reports"]:
+            return self.respond(environ, [
+                {"id": report_id, "title": title, "tables": list(REPORT_TABLES[title])}
+                for report_id, title in REPORT_IDS.items()
+            ])
+        if len(parts) == 2 and parts[0] == "reports":
+            return self.report(environ, conn, parts[1], fmt)
+        if len(parts) == 2 and parts[0] == "tables":
+            return self.table(environ, conn, parts[1], query, fmt)
+        if len(parts) == 3 and parts[0] == "options":
+            return self.options(environ, conn, parts[1], parts[2])
+        raise ApiError(404, f"no route for {path}")
+
+    def respond(self, environ, payload, etag=None):
+        headers = {"Content-Type": "application/json", "Cache-Control": "no-cache"}
+        if etag:
+            headers["ETag"] = etag
+        return 200, headers, _dumps(payload).encode()
+
+    def not_modified(self, environ, etag):
+        """A 304 response if the client already has `etag`, else None."""
+        if etag in [t.strip() for t in environ.get("HTTP_IF_NONE_MATCH", "").split(",")]:
+            return 304, {"ETag": etag, "Cache-Control": "no-cache"}, b""
+        return None
+
+    def stream(self, conn, sql, params, fmt, name, etag):
+        """Every row of `sql` as an NDJSON/CSV/Parquet body, encoded as it is read."""
+        headers = {"Content-Type": export.FORMATS[fmt][0], "Cache-Control": "no-cache", "ETag": etag}
+        if fmt != "ndjson":
+            headers["Content-Disposition"] = f'attachment; filename="{export.file_name(name, fmt)}"'
+        return 200, headers, export.encode(conn, sql, params, fmt)
+
+    # -- resources ----------------------------------------------------------
+
+    def report(self, environ, conn, report_id, fmt):
+        title = REPORT_IDS.get(report_id)
+        if title is None:
+            raise ApiError(404, f"no report {report_id}; see /reports")
+        table_versions = versions.current(conn, REPORT_TABLES[title])
+        if title in DATED_REPORTS:
+            table_versions["date"] = date.today().isoformat()
+        etag = _etag(environ["PATH_INFO"], {"format": fmt}, table_versions)
+        cached = self.not_modified(environ, etag)
+        if cached:
+            return cached
+        if fmt != "json":
+            sql, params = export.report_query(title)
+            return self.stream(conn, sql, params, fmt, f"report_{report_id}", etag)
+        rows = records(self.reports.get(conn, title))
+        return self.respond(environ, {"id": report_id, "title": title, "rows": rows}, etag)
+
+    def _filters(self, table, query):
+        pk, columns = API_TABLES[table]
+        equals = {}
+        for name, value in query.items():
+            if name not in columns:
+                raise ApiError(400, f"cannot filter {table} on {name!r}; use one of {', '.join(columns)}")
+            if name.endswith("_ID"):
+                try:
+                    value = parse_id(value)
+                except ValueError:
+                    raise ApiError(400, f"{name} must be a number")
+            equals[name] = value
+        return build_where(equals=equals)
+
+    def _int_param(self, query, name, default, low, high):
+        try:
+            value = int(query.pop(name, default))
+        except ValueError:
+            raise ApiError(400, f"{name} must be a number")
+        return min(max(value, low), high)
+
+    def table(self, environ, conn, table, query, fmt):
+        if table not in API_TABLES:
+            raise ApiError(404, f"no table {table}; use one of {', '.join(API_TABLES)}")
+        etag = _etag(environ["PATH_INFO"], {**query, "format": fmt}, versions.current(conn, (table,)))
+        cached = self.not_modified(environ, etag)
+        if cached:
+            return cached
+        pk = API_TABLES[table][0]
+        page = self._int_param(query, "page", 1, 1, sys.maxsize)
+        page_size = self._int_param(query, "page_size", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        text = query.pop("q", "")
+        where, params = self._filters(table, query)
+        expression = search.match_expression(conn, table, text) if text else None
+
+        if fmt != "json":
+            sql, params = export.table_query(table, where, params, expression)
+            return self.stream(conn, sql, params, fmt, table, etag)
+        if expression:
+            total = search.count_matches(conn, table, expression, where, params)
+            df = search.fetch_matches(conn, table, expression, where, params, page, page_size)
+        else:
+            total = count_rows(conn, table, where, params)
+            df = fetch_page(conn, table, pk, where, params, page, page_size)
+        return self.respond(environ, {
+            "table": table,
+            "page": page,
+            "page_size": page_size,
+            "pages": math.ceil(total / page_size),
+            "total": total,
+            "rows": records(df),
+        }, etag)
+
+    def options(self, environ, conn, table, column):
+        if table not in API_TABLES or column not in API_TABLES[table][1] or column.endswith("_ID"):
+            raise ApiError(404, f"no option list for {table}.{column}")
+        etag = _etag(environ["PATH_INFO"], {}, versions.current(conn, (table,)))
+        return self.not_modified(environ, etag) or self.respond(
+            environ, option_values(self.cache, conn, table, column), etag)
+
+
+def make_app(path=DB_PATH, replica_budget=None):
+    """The WSGI application for the database at `path` (migrated first if needed).
+
+    With `replica_budget` (bytes), reads are served from an in-memory copy.
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+    return Api(ReaderPool(path, replica_budget=replica_budget))
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        data = self.body
+        if self.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def ndjson(self):
+        return [json.loads(line) for line in self.text.splitlines() if line]
+
+
+class Client:
+    """Calls a WSGI application in-process: Client(make_app(db)).get("/reports/1")."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, path, params=None, headers=None, method="GET"):
+        path, _, query = path.partition("?")
+        if params:
+            query = "&".join(q for q in (query, urlencode(params)) if q)
+        environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query,
+                   "wsgi.input": io.BytesIO()}
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        setup_testing_defaults(environ)
+        captured = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            captured["status"] = int(status.split()[0])
+            captured["headers"] = dict(response_headers)
+
+        body = b"".join(self.app(environ, start_response))
+        return Response(captured["status"], captured["headers"], body)
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON API for food_data.db")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--replica-mb", type=int, default=0,
+                        help="serve reads from an in-memory copy of the database if twice its size fits in this many MiB")
+    args = parser.parse_args(argv)
+    app = make_app(args.db, args.replica_mb * 2**20)
+    with make_server(args.host, args.port, app, server_class=ThreadingWSGIServer) as server:
+        print(f"serving {args.db} on http://{args.host}:{args.port}")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
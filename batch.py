@@ -0,0 +1,268 @@
+"""Batch insert/update/delete of food listings and claims from uploaded files.
+
+    python batch.py --db food_data.db food_listings insert new_listings.csv
+    python batch.py --db food_data.db claims update closed_claims.jsonl
+
+A batch file is CSV with a header row, or JSONL with one object per line,
+keyed by the table's column names. It is read and validated in a single
+streaming pass: types, required fields and allowed values are checked per
+row, and rows that fail are reported with their line number. Valid rows are
+applied in chunks. Each chunk runs in its own write transaction that first
+checks keys and references, with one json_each lookup per column, and then
+writes the rows that pass with executemany.
+
+- insert: the primary key is optional; when given it must not exist yet.
+- update: the primary key, plus the columns to change. Blank or missing
+  values leave a column unchanged.
+- delete: only the primary key is used.
+"""
+import argparse
+import csv
+import io
+import json
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from dates import to_iso_timestamp
+from loader import CONVERTERS
+from migrations import TABLE_COLUMNS
+import versions
+
+CHUNK_SIZE = 5_000
+OPERATIONS = ("insert", "update", "delete")
+CLAIM_STATUSES = ("Pending", "Completed", "Cancelled")
+
+# table -> columns an insert must provide, and {column: referenced table}
+BATCH_TABLES = {
+    "food_listings": {
+        "required": ("Food_Name", "Quantity", "Expiry_Date", "Provider_ID"),
+        "references": {"Provider_ID": "providers"},
+    },
+    "claims": {
+        "required": ("Food_ID", "Receiver_ID", "Status"),
+        "references": {"Food_ID": "food_listings", "Receiver_ID": "receivers"},
+    },
+}
+
+PRIMARY_KEYS = {
+    "providers": "Provider_ID",
+    "receivers": "Receiver_ID",
+    "food_listings": "Food_ID",
+    "claims": "Claim_ID",
+}
+
+
+def _check(table, column, value):
+    """Domain checks beyond the column type; returns an error message or None."""
+    if column == "Quantity" and value is not None and value < 1:
+        return "Quantity must be at least 1"
+    if table == "claims" and column == "Status" and value not in CLAIM_STATUSES:
+        return f"Status must be one of {', '.join(CLAIM_STATUSES)}"
+    return None
+
+
+def read_records(stream, fmt):
+    """Yield (line_number, {column: raw value}) from a CSV or JSONL byte or text stream."""
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):  # uploads and files opened "rb"
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "jsonl":
+        for line, text in enumerate(stream, 1):
+            if text.strip():
+                try:
+                    record = json.loads(text)
+                except json.JSONDecodeError as e:
+                    yield line, e
+                    continue
+                yield line, record if isinstance(record, dict) else ValueError("expected a JSON object")
+    else:
+        raise ValueError(f"unknown batch format {fmt!r}; use csv or jsonl")
+
+
+def validate(records, table, operation):
+    """Yield (line, row, error) where row is {column: converted value} for valid records."""
+    columns = TABLE_COLUMNS[table]
+    converters = dict(zip(columns, CONVERTERS[table]))
+    pk = PRIMARY_KEYS[table]
+    required = BATCH_TABLES[table]["required"]
+    for line, record in records:
+        if isinstance(record, Exception):
+            yield line, None, str(record)
+            continue
+        unknown = [c for c in record if c not in converters]
+        if unknown:
+            yield line, None, f"unknown columns: {', '.join(map(str, unknown))}"
+            continue
+        row = {}
+        error = None
+        for column, value in record.items():
+            if value is None or value == "":
+                continue  # blank means "not given"
+            if isinstance(value, bool):
+                error = f"{column}: expected a number or text, got {json.dumps(value)}"
+                break
+            try:
+                row[column] = converters[column](value if isinstance(value, (int, float)) else str(value))
+            except (ValueError, TypeError) as e:
+                error = f"{column}: {e}"
+                break
+            if isinstance(value, float) and isinstance(row[column], int) and row[column] != value:
+                error = f"{column}: {value} is not a whole number"  # int() would truncate it
+                break
+            error = _check(table, column, row[column])
+            if error:
+                break
+        if error is None:
+            if operation == "insert":
+                missing = [c for c in required if c not in row]
+                if missing:
+                    error = f"missing {', '.join(missing)}"
+            elif pk not in row:
+                error = f"missing {pk}"
+            elif operation == "update" and len(row) == 1:
+                error = "nothing to update"
+        if error is None and operation == "insert" and table == "claims":
+            row.setdefault("Timestamp", to_iso_timestamp(datetime.now()))
+        yield line, (row if error is None else None), error
+
+
+def _existing(conn, table, column, values):
+    """The subset of `values` present in `table`.`column`."""
+    if not values:
+        return set()
+    rows = conn.execute(
+        f"SELECT {column} FROM {table} WHERE {column} IN (SELECT value FROM json_each(?))",
+        (json.dumps(sorted(values)),),
+    )
+    return {value for value, in rows}
+
+
+def _reject_bad_keys(conn, table, operation, chunk, errors):
+    """Drop rows whose keys or references don't hold, recording why; returns the rest."""
+    pk = PRIMARY_KEYS[table]
+    keys = {row[pk] for _, row in chunk if pk in row}
+    present = _existing(conn, table, pk, keys)
+    references = {
+        column: _existing(conn, target, PRIMARY_KEYS[target], {row[column] for _, row in chunk if column in row})
+        for column, target in BATCH_TABLES[table]["references"].items()
+    } if operation != "delete" else {}
+
+    kept = []
+    seen = set()
+    for line, row in chunk:
+        key = row.get(pk)
+        if operation == "insert" and key is not None and (key in present or key in seen):
+            errors.append((line, f"{pk} {key} already exists"))
+        elif operation != "insert" and key not in present:
+            errors.append((line, f"no {table} row with {pk} {key}"))
+        else:
+            bad = next((c for c, ok in references.items() if c in row and row[c] not in ok), None)
+            if bad:
+                errors.append((line, f"{bad} {row[bad]} does not exist"))
+                continue
+            seen.add(key)
+            kept.append(row)
+    return kept
+
+
+def _statements(table, operation, rows):
+    """Group rows into (sql, params list) so each group is one executemany."""
+    pk = PRIMARY_KEYS[table]
+    groups = {}
+    for row in rows:
+        if operation == "delete":
+            columns = (pk,)
+            sql = f"DELETE FROM {table} WHERE {pk} = ?"
+        elif operation == "update":
+            columns = tuple(c for c in row if c != pk) + (pk,)
+            assignments = ", ".join(f"{c} = ?" for c in columns[:-1])
+            sql = f"UPDATE {table} SET {assignments} WHERE {pk} = ?"
+        else:
+            columns = tuple(row)
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        groups.setdefault(sql, []).append(tuple(row[c] for c in columns))
+    return groups.items()
+
+
+@contextmanager
+def transaction(conn, table):
+    """BEGIN IMMEDIATE ... COMMIT on a plain connection, bumping `table`'s version."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        versions.bump(conn, [table])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def apply_batch(write, table, operation, stream, fmt, chunk_size=CHUNK_SIZE):
+    """Validate and apply a batch file; returns (rows applied, [(line, error)], seconds).
+
+    `write` returns a context manager yielding a connection in a write
+    transaction, e.g. `lambda: pool.writer(table)` in the app or
+    `lambda: transaction(conn, table)`.
+    """
+    if table not in BATCH_TABLES or operation not in OPERATIONS:
+        raise ValueError(f"batch {operation!r} is not supported for {table!r}")
+    start = time.perf_counter()
+    errors = []
+    applied = 0
+
+    def flush(chunk):
+        with write() as db:
+            rows = _reject_bad_keys(db, table, operation, chunk, errors)
+            for sql, params in _statements(table, operation, rows):
+                db.executemany(sql, params)
+        return len(rows)
+
+    chunk = []
+    for line, row, error in validate(read_records(stream, fmt), table, operation):
+        if error:
+            errors.append((line, error))
+            continue
+        chunk.append((line, row))
+        if len(chunk) >= chunk_size:
+            applied += flush(chunk)
+            chunk = []
+    if chunk:
+        applied += flush(chunk)
+    errors.sort()
+    return applied, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a CSV/JSONL batch to food_listings or claims")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("table", choices=sorted(BATCH_TABLES))
+    parser.add_argument("operation", choices=OPERATIONS)
+    parser.add_argument("file")
+    args = parser.parse_args(argv)
+
+    fmt = "jsonl" if args.file.endswith((".jsonl", ".ndjson")) else "csv"
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        with open(args.file, newline="", encoding="utf-8-sig") as f:
+            applied, errors, seconds = apply_batch(lambda: transaction(conn, args.table), args.table,
+                                                   args.operation, f, fmt, args.chunk_size)
+    finally:
+        conn.close()
+    print(f"{args.operation}: {applied:,} rows applied, {len(errors):,} rejected in {seconds:.2f}s "
+          f"({applied / seconds if seconds else 0:,.0f} rows/s)")
+    for line, error in errors[:20]:
+        print(f"    line {line}: {error}")
+    if len(errors) > 20:
+        print(f"    ... {len(errors) - 20} more rejected rows")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Benchmarks of the app's query paths on synthetic data.
+
+    python benchmark.py --scales 10k,1m --out bench.json
+    python benchmark.py --scales 10k,1m --baseline bench.json   # exit 1 on regressions
+
+For each scale, synthetic.py generates the CSVs (cached under --work) and
+loader.py builds a database from them. The benchmark then times:
+
+- every canned report in reports.SQL_QUERIES, run uncached;
+- the Filter & Search paths, meaning count plus page for the filter
+  combinations the page offers, and full-text and fuzzy search;
+- the Analytics & Insights computations, and the columnar snapshot export
+  and its vectorized reports;
+- single-row CRUD writes through the pool's WriteQueue (pool.writes);
+- the claim demand forecast: a full retrain, then incremental updates that
+  each add one day of FORECAST_NEW_CLAIMS claims. The incremental time
+  should stay flat as the scale grows.
+
+Each case reports the median and minimum time over --repeat runs, plus the
+rows it returned. The result is JSON. A regression is a median that is more
+than --tolerance slower than the baseline's and more than NOISE_MS slower in
+absolute terms.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import analytics
+import dimensions
+import forecast
+import search
+import snapshots
+import synthetic
+from db import ConnectionPool
+from filters import build_where, count_rows, distinct_values, fetch_page, PAGE_SIZE
+from loader import build_database
+from reports import SQL_QUERIES
+
+REPEAT = 5
+TOLERANCE = 0.25
+NOISE_MS = 1.0
+CRUD_OPS = 50
+FORECAST_NEW_CLAIMS = 1_000
+
+
+def timed(fn, repeat=REPEAT):
+    """Run `fn` `repeat` times; {median_ms, min_ms, rows} where rows is len() of its result."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    try:
+        rows = len(result)
+    except TypeError:
+        rows = None
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "rows": rows}
+
+
+def _filtered_page(conn, table, order_by, equals, page=1):
+    where, params = build_where(equals=equals)
+    total = count_rows(conn, table, where, params)
+    return fetch_page(conn, table, order_by, where, params, page) if total else []
+
+
+def _search_page(conn, table, text):
+    expression = search.match_expression(conn, table, text)
+    if not expression or not search.count_matches(conn, table, expression):
+        return []
+    return search.fetch_matches(conn, table, expression)
+
+
+def _most_common(conn, table, column):
+    return conn.execute(
+        f"SELECT {column} FROM {table} GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0]
+
+
+def bench_reports(conn, repeat):
+    return {f"report {title.split('.')[0]}": timed(lambda sql=sql: pd.read_sql_query(sql, conn), repeat)
+            for title, sql in SQL_QUERIES.items()}
+
+
+def bench_filters(conn, repeat):
+    rows = conn.execute("SELECT COUNT(*) FROM food_listings").fetchone()[0]
+    last_page = max(1, -(-rows // PAGE_SIZE))
+    city = _most_common(conn, "food_listings", "Location")
+    receiver = _most_common(conn, "claims", "Receiver_ID")
+    cases = {
+        "food_listings first page": lambda: _filtered_page(conn, "food_listings", "Food_ID", {}),
+        "food_listings last page": lambda: _filtered_page(conn, "food_listings", "Food_ID", {}, last_page),
+        "food_listings by city": lambda: _filtered_page(conn, "food_listings", "Food_ID", {"Location": city}),
+        "food_listings by food and meal type": lambda: _filtered_page(
+            conn, "food_listings", "Food_ID", {"Food_Type": "Vegetarian", "Meal_Type": "Dinner"}),
+        "claims by status and receiver": lambda: _filtered_page(
+            conn, "claims", "Claim_ID", {"Status": "Pending", "Receiver_ID": receiver}),
+        "receivers by city": lambda: _filtered_page(conn, "receivers", "Receiver_ID", {"City": city}),
+        "city options": lambda: distinct_values(conn, "food_listings", "Location"),
+        "city options (dimension)": lambda: dimensions.option_values(conn, "food_listings", "Location"),
+        "search providers": lambda: _search_page(conn, "providers", "smith"),
+        "search food fuzzy": lambda: _search_page(conn, "food_listings", "bred"),
+    }
+    return {name: timed(fn, repeat) for name, fn in cases.items()}
+
+
+def bench_analytics(conn, repeat, work_dir):
+    results = {
+        "meal type claims": timed(lambda: analytics.meal_type_claims(conn), repeat),
+        "top providers": timed(lambda: analytics.top_providers(conn), repeat),
+    }
+    root = os.path.join(work_dir, "snapshots")
+    results["snapshot export"] = timed(lambda: [snapshots.export(conn, root, keep=1)], 1)
+    snap = snapshots.Snapshot.latest(root)
+    for name, report in snapshots.REPORTS.items():
+        results[f"snapshot {name}"] = timed(lambda report=report: report(snap), repeat)
+    shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def bench_crud(pool, ops=CRUD_OPS):
+    """Median latency of single-row writes through the write queue, as the CRUD page makes them."""
+    conn = pool.reader()
+    provider_id = conn.execute("SELECT MIN(Provider_ID) FROM providers").fetchone()[0]
+    new_ids = []
+
+    def insert():
+        new_ids.append(pool.writes.submit(("food_listings",), lambda db: db.execute(
+            """INSERT INTO food_listings (Food_Name, Quantity, Expiry_Date, Provider_ID,
+                   Provider_Type, Location, Food_Type, Meal_Type)
+               VALUES ('Bench', 10, '2025-03-20', ?, 'Restaurant', 'Bench City', 'Vegan', 'Lunch')""",
+            (provider_id,)).lastrowid).result())
+
+    def update():
+        pool.writes.execute(("food_listings",), "UPDATE food_listings SET Quantity = Quantity + 1 WHERE Food_ID = ?",
+                            (new_ids[0],)).result()
+
+    def delete():
+        pool.writes.execute(("food_listings",), "DELETE FROM food_listings WHERE Food_ID = ?",
+                            (new_ids.pop(),)).result()
+
+    return {f"{name} listing": timed(fn, ops)
+            for name, fn in (("insert", insert), ("update", update), ("delete", delete))}
+
+
+def bench_forecast(pool, repeat, new_claims=FORECAST_NEW_CLAIMS):
+    """Full forecast retrain, then `repeat` incremental updates of one new day each."""
+    def run(step):
+        start = time.perf_counter()
+        with pool.writer() as db:
+            stats = step(db)
+        return (time.perf_counter() - start) * 1000, stats
+
+    full_ms, stats = run(forecast.rebuild)
+    results = {"full history": {"median_ms": full_ms, "min_ms": full_ms, "rows": stats["new_claims"]}}
+
+    conn = pool.reader()
+    last_day = datetime.fromisoformat(conn.execute("SELECT MAX(Day) FROM forecast_daily").fetchone()[0])
+    food_ids = [r[0] for r in conn.execute("SELECT Food_ID FROM food_listings ORDER BY RANDOM() LIMIT ?",
+                                           (new_claims,))]
+    receiver_id = conn.execute("SELECT MIN(Receiver_ID) FROM receivers").fetchone()[0]
+    times = []
+    # the first new day trains with the last generated day as the day
+    # before, which is scale-sized work; time the days after
+    for i in range(1, repeat + 2):
+        day = (last_day + timedelta(days=i)).strftime("%Y-%m-%d 12:00:00")
+        with pool.writer("claims") as db:
+            db.executemany("INSERT INTO claims (Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, 'Pending', ?)",
+                           [(food_id, receiver_id, day) for food_id in food_ids])
+        ms = run(forecast.update)[0]
+        if i > 1:
+            times.append(ms)
+    results["incremental day"] = {"median_ms": statistics.median(times), "min_ms": min(times),
+                                  "rows": len(food_ids)}
+    return results
+
+
+def run_scale(rows, seed, work_dir, repeat, data_dir="."):
+    data = os.path.join(work_dir, f"data_{rows}_{seed}")
+    if not os.path.exists(os.path.join(data, "claims_data.csv")):
+        synthetic.generate(data, rows, seed, data_dir)
+    db_path = os.path.join(work_dir, f"bench_{rows}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    start = time.perf_counter()
+    build_database(db_path, data, out=io.StringIO())
+    load_ms = (time.perf_counter() - start) * 1000
+
+    pool = ConnectionPool(db_path)
+    conn = pool.reader()
+    results = {
+        "load": {"build database": {"median_ms": load_ms, "min_ms": load_ms, "rows": 4 * rows}},
+        "reports": bench_reports(conn, repeat),
+        "filters": bench_filters(conn, repeat),
+        "analytics": bench_analytics(conn, repeat, work_dir),
+        "crud": bench_crud(pool),
+        "forecast": bench_forecast(pool, repeat),
+    }
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE, noise_ms=NOISE_MS):
+    """Cases whose median regressed against `baseline`: [(scale, group, case, base_ms, now_ms)]."""
+    regressions = []
+    for scale, groups in results["scales"].items():
+        for group, cases in groups.items():
+            for case, now in cases.items():
+                base = baseline.get("scales", {}).get(scale, {}).get(group, {}).get(case)
+                if not base or "median_ms" not in now:
+                    continue
+                if (now["median_ms"] > base["median_ms"] * (1 + tolerance)
+                        and now["median_ms"] - base["median_ms"] > noise_ms):
+                    regressions.append((scale, group, case, base["median_ms"], now["median_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reports, filters, analytics, CRUD and forecasts")
+    parser.add_argument("--scales", default="10k", help="comma-separated rows per table, e.g. 10k,1m,10m")
+    parser.add_argument("--seed", type=int, default=synthetic.SEED)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--work", help="directory for generated data (default: a temporary one)")
+    parser.add_argument("--data-dir", default=".", help="directory with the shipped CSVs")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    work_dir = args.work or tempfile.mkdtemp(prefix="food_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    results = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "scales": {},
+    }
+    try:
+        for scale in args.scales.split(","):
+            print(f"benchmarking {scale} rows per table ...", file=sys.stderr)
+            results["scales"][scale] = run_scale(synthetic.parse_rows(scale), args.seed, work_dir,
+                                                 args.repeat, args.data_dir)
+    finally:
+        if not args.work:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for scale, group, case, base, now in regressions:
+            print(f"REGRESSION {scale} {group} / {case}: {base:.2f} ms -> {now:.2f} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("no regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
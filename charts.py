@@ -0,0 +1,62 @@
+"""Plotly figure specs for the Analytics & Insights page.
+
+Figures are plain Plotly JSON dicts built from the aggregated rows and drawn
+in the browser by st.plotly_chart, so the server never rasterizes an image.
+Specs are cached per chart and rebuilt only when a table they read changes.
+"""
+from analytics import meal_type_claims, top_providers
+
+
+def bar_chart(x, y, title, x_title, y_title, color, tick_angle=0):
+    return {
+        "data": [{
+            "type": "bar",
+            "x": list(x),
+            "y": [int(v) for v in y],
+            "marker": {"color": color, "line": {"color": "black", "width": 1}},
+        }],
+        "layout": {
+            "title": {"text": title},
+            "xaxis": {"title": {"text": x_title}, "tickangle": tick_angle},
+            "yaxis": {"title": {"text": y_title}},
+        },
+    }
+
+
+def meal_type_chart(conn):
+    df = meal_type_claims(conn)
+    return bar_chart(df["Meal_Type"], df["Claims"], "Most Claimed Meal Types",
+                     "Meal Type", "Number of Claims", "skyblue")
+
+
+def top_providers_chart(conn, limit=10):
+    df = top_providers(conn, limit)
+    return bar_chart(df["Name"], df["Quantity"], f"Top {limit} Food Donating Providers",
+                     "Provider Name", "Total Quantity Donated", "orange", tick_angle=-45)
+
+
+def forecast_chart(df, city):
+    """Stacked bars of predicted claims per day, one trace per meal type."""
+    return {
+        "data": [{"type": "bar", "name": meal, "x": list(df.index), "y": [round(v, 2) for v in df[meal]]}
+                 for meal in df.columns],
+        "layout": {
+            "title": {"text": f"Predicted Daily Claims in {city}"},
+            "barmode": "stack",
+            "xaxis": {"title": {"text": "Day"}},
+            "yaxis": {"title": {"text": "Predicted Claims"}},
+        },
+    }
+
+
+# chart name -> (tables it reads, builder)
+CHARTS = {
+    "meal_type_claims": (("claims", "food_listings"), meal_type_chart),
+    "top_providers": (("food_listings", "providers"), top_providers_chart),
+}
+
+
+def chart_spec(cache, conn, name):
+    """Figure spec for `name` from a versions.VersionedCache."""
+    tables, build = CHARTS[name]
+    return cache.get(conn, ("chart", name), tables, build)
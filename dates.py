@@ -0,0 +1,65 @@
+"""Canonical date handling for food_data.db.
+
+Dates are stored as ISO-8601 text ("2025-03-17", "2025-03-05 05:26:00") so
+they sort correctly, compare against DATE('now') and can be range-scanned
+through an index. The partner CSVs use US formats ("3/17/2025",
+"3/5/2025 5:26"), which are converted on the way in.
+"""
+import re
+from datetime import date, datetime
+
+DATE_FORMAT = "%Y-%m-%d"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_DATE_INPUTS = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y"]
+_TIMESTAMP_INPUTS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S",
+                     "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%y %H:%M"]
+
+
+# Fast path for the partner export format; strptime is the bulk of load time
+_US_DATETIME = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?: (\d{1,2}):(\d{2})(?::(\d{2}))?)?$")
+
+
+def _parse(value, formats):
+    m = _US_DATETIME.match(value)
+    if m:
+        month, day, year, hour, minute, second = m.groups()
+        return datetime(int(year), int(month), int(day),
+                        int(hour or 0), int(minute or 0), int(second or 0))
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date: {value!r}")
+
+
+def to_iso_date(value):
+    """Return `value` as YYYY-MM-DD; None/blank stays None."""
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime(DATE_FORMAT)
+    value = str(value).strip()
+    if not value:
+        return None
+    if " " in value:
+        value = value.split(" ", 1)[0]
+    return _parse(value, _DATE_INPUTS).strftime(DATE_FORMAT)
+
+
+def to_iso_timestamp(value):
+    """Return `value` as YYYY-MM-DD HH:MM:SS; a bare date becomes midnight."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).strftime(TIMESTAMP_FORMAT)
+    value = str(value).strip()
+    if not value:
+        return None
+    if " " not in value and "T" not in value:
+        return _parse(value, _DATE_INPUTS).strftime(TIMESTAMP_FORMAT)
+    return _parse(value, _TIMESTAMP_INPUTS).strftime(TIMESTAMP_FORMAT)
+
@@ -0,0 +1,157 @@
+"""Connection management for food_data.db.
+
+The database runs in WAL mode so readers never wait for a writer. Reads
+use a small pool of read-only connections, and all writes go through one
+shared writer connection serialized by a lock, which keeps SQLite's single
+write lock uncontended and avoids "database is locked" errors between
+sessions. Single-statement writes from the app go through `pool.writes`, a
+write_queue.WriteQueue that group-commits whatever sessions submitted at the
+same time. The app holds one `ConnectionPool` per process (st.cache_resource).
+
+With a `replica_budget` (bytes), readers are served from an in-memory copy
+of the file (replica.HotReplica) as long as it fits and is current.
+"""
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+
+from migrations import migrate
+from replica import HotReplica
+from write_queue import WriteQueue
+import versions
+
+DB_PATH = "food_data.db"
+BUSY_TIMEOUT_MS = 5000
+READERS = 8
+
+
+def read_only_uri(path):
+    return Path(path).resolve().as_uri() + "?mode=ro"
+
+
+def connect_reader(path=DB_PATH, busy_timeout_ms=BUSY_TIMEOUT_MS, factory=sqlite3.Connection):
+    conn = sqlite3.connect(read_only_uri(path), uri=True, timeout=busy_timeout_ms / 1000,
+                           check_same_thread=False, factory=factory)
+    conn.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}")
+    return conn
+
+
+def connect_writer(path=DB_PATH, busy_timeout_ms=BUSY_TIMEOUT_MS, factory=sqlite3.Connection):
+    conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, check_same_thread=False,
+                           factory=factory)
+    conn.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    # WAL + NORMAL only syncs at checkpoints; a power cut can lose the last
+    # commits but never corrupts the file
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class _Lease:
+    """A pooled connection checked out by one thread; held in that thread's local storage."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ReaderPool:
+    """Up to `size` read-only connections shared by all threads, for processes that never write (api.py).
+
+    A thread checks a connection out on its first reader() call and keeps it
+    until the thread ends, when it goes back to the pool. Streamlit reruns
+    and WSGI requests each run on a fresh thread, so they reuse the same few
+    connections instead of opening one apiece.
+    """
+
+    def __init__(self, path=DB_PATH, busy_timeout_ms=BUSY_TIMEOUT_MS, factory=sqlite3.Connection,
+                 replica_budget=None, size=READERS):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.factory = factory
+        self.size = size
+        self.opened = 0
+        self._idle = queue.LifoQueue()  # most recently used first, so its pages are warm
+        self._open_lock = threading.Lock()
+        self._local = threading.local()
+        self.replica = None
+        if replica_budget:
+            self.replica = HotReplica(partial(connect_reader, path, busy_timeout_ms), replica_budget, factory)
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self.opened < self.size:
+                self.opened += 1
+                return connect_reader(self.path, self.busy_timeout_ms, self.factory)
+        try:
+            return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"all {self.size} reader connections are in use") from None
+
+    def _checkin(self, conn):
+        try:
+            if conn.in_transaction:  # a reader left a read transaction open
+                conn.rollback()
+        except sqlite3.ProgrammingError:  # closed by its borrower: free the slot
+            with self._open_lock:
+                self.opened -= 1
+            return
+        self._idle.put(conn)
+
+    def reader(self):
+        """Read-only connection checked out to the calling thread (on the replica when it is current)."""
+        if self.replica is not None:
+            conn = self.replica.reader()
+            if conn is not None:
+                return conn
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = _Lease(self._checkout())
+            # the thread's locals are dropped when it ends, which returns the connection
+            weakref.finalize(lease, self._checkin, lease.conn)
+            self._local.lease = lease
+        return lease.conn
+
+
+class ConnectionPool(ReaderPool):
+    """Pooled read-only connections plus a single lock-guarded writer.
+
+    With a `profiler.Profiler`, every connection the pool opens is profiled.
+    """
+
+    def __init__(self, path=DB_PATH, busy_timeout_ms=BUSY_TIMEOUT_MS, profiler=None, replica_budget=None):
+        factory = profiler.connection_class if profiler else sqlite3.Connection
+        self._write_lock = threading.Lock()
+        self._writer = connect_writer(path, busy_timeout_ms, factory)
+        migrate(self._writer)  # before the replica copies the file
+        super().__init__(path, busy_timeout_ms, factory, replica_budget)
+        self.writes = WriteQueue(self._writer, self._write_lock)
+
+    @contextmanager
+    def writer(self, *tables):
+        """Exclusive use of the writer connection in a BEGIN IMMEDIATE transaction; commits on success.
+
+        The write lock is taken up front, so what the block reads before it
+        writes (e.g. batch.py's key checks) cannot change before the commit.
+
+        `tables` are the data tables the block writes to; their change
+        counters are bumped in the same transaction so cached results
+        that depend on them are invalidated.
+        """
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+                if tables:
+                    versions.bump(self._writer, tables)
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
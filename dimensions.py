@@ -0,0 +1,187 @@
+"""Dimension tables behind the Filter & Search dropdowns.
+
+Each low-cardinality vocabulary (cities, provider/receiver types, food and
+meal types, claim statuses) gets a dictionary table mapping a stable integer
+Code to its Value. `dimension_usage` counts how many fact rows use each code
+per source column, and triggers keep both current on every INSERT, UPDATE
+and DELETE. A dropdown's option list is therefore a read of a few dozen rows
+instead of a DISTINCT over the fact table. Codes are never reused, so they
+can be cached or exported safely.
+
+    python dimensions.py --db food_data.db            # consistency check
+    python dimensions.py --db food_data.db --rebuild  # recompute usage
+"""
+import argparse
+import sqlite3
+import sys
+
+import versions
+
+# dimension table -> the fact columns whose values it encodes
+DIMENSIONS = {
+    "dim_city": [("food_listings", "Location"), ("providers", "City"), ("receivers", "City")],
+    "dim_provider_type": [("food_listings", "Provider_Type"), ("providers", "Type")],
+    "dim_receiver_type": [("receivers", "Type")],
+    "dim_food_type": [("food_listings", "Food_Type")],
+    "dim_meal_type": [("food_listings", "Meal_Type")],
+    "dim_claim_status": [("claims", "Status")],
+}
+
+# (table, column) -> dimension table
+DIMENSION_OF = {source: dim for dim, sources in DIMENSIONS.items() for source in sources}
+
+USAGE_DDL = """CREATE TABLE IF NOT EXISTS dimension_usage (
+                   source TEXT NOT NULL,
+                   code INTEGER NOT NULL,
+                   rows INTEGER NOT NULL,
+                   PRIMARY KEY (source, code)
+               ) WITHOUT ROWID"""
+
+
+def source_name(table, column):
+    return f"{table}.{column}"
+
+
+def _dimension_table(name):
+    return f"""CREATE TABLE IF NOT EXISTS {name} (
+                   Code INTEGER PRIMARY KEY,
+                   Value TEXT NOT NULL UNIQUE
+               )"""
+
+
+def _add(dim, table, column, row):
+    source = source_name(table, column)
+    return f"""
+        INSERT INTO {dim} (Value)
+            SELECT {row}.{column}
+            WHERE {row}.{column} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {dim} WHERE Value = {row}.{column});
+        INSERT INTO dimension_usage (source, code, rows)
+            SELECT '{source}', Code, 0 FROM {dim} d
+            WHERE Value = {row}.{column}
+              AND NOT EXISTS (SELECT 1 FROM dimension_usage u WHERE u.source = '{source}' AND u.code = d.Code);
+        UPDATE dimension_usage SET rows = rows + 1
+            WHERE source = '{source}' AND code = (SELECT Code FROM {dim} WHERE Value = {row}.{column});"""
+
+
+def _remove(dim, table, column, row):
+    source = source_name(table, column)
+    code = f"(SELECT Code FROM {dim} WHERE Value = {row}.{column})"
+    return f"""
+        UPDATE dimension_usage SET rows = rows - 1 WHERE source = '{source}' AND code = {code};
+        DELETE FROM dimension_usage WHERE source = '{source}' AND code = {code} AND rows = 0;"""
+
+
+def _columns_by_table():
+    tables = {}
+    for (table, column), dim in DIMENSION_OF.items():
+        tables.setdefault(table, []).append((dim, column))
+    return tables
+
+
+def trigger_ddl():
+    ddl = []
+    for table, columns in _columns_by_table().items():
+        adds = "".join(_add(dim, table, column, "NEW") for dim, column in columns)
+        removes = "".join(_remove(dim, table, column, "OLD") for dim, column in columns)
+        watched = ", ".join(column for _, column in columns)
+        ddl += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_dimensions_insert AFTER INSERT ON {table} BEGIN{adds}\nEND",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_dimensions_delete AFTER DELETE ON {table} BEGIN{removes}\nEND",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_dimensions_update AFTER UPDATE OF {watched} ON {table}
+                BEGIN{removes}{adds}\nEND""",
+        ]
+    return ddl
+
+
+def drop_triggers(conn):
+    for table in _columns_by_table():
+        for event in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_dimensions_{event}")
+
+
+def _fresh_usage(table, column):
+    """GROUP BY over the fact column, as (source, code, rows) rows."""
+    dim = DIMENSION_OF[(table, column)]
+    return f"""SELECT '{source_name(table, column)}', d.Code, COUNT(*)
+               FROM {table} t JOIN {dim} d ON d.Value = t.{column}
+               GROUP BY d.Code"""
+
+
+def install(conn):
+    """Create the dimension tables and triggers and fill them from the data."""
+    for dim in DIMENSIONS:
+        conn.execute(_dimension_table(dim))
+    conn.execute(USAGE_DDL)
+    for ddl in trigger_ddl():
+        conn.execute(ddl)
+    rebuild(conn)
+
+
+def rebuild(conn):
+    """Add missing codes and recount usage; existing codes keep their values."""
+    for (table, column), dim in DIMENSION_OF.items():
+        conn.execute(f"""INSERT OR IGNORE INTO {dim} (Value)
+                         SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL
+                         ORDER BY {column}""")
+    conn.execute("DELETE FROM dimension_usage")
+    for table, column in DIMENSION_OF:
+        conn.execute(f"INSERT INTO dimension_usage (source, code, rows) {_fresh_usage(table, column)}")
+
+
+def check(conn):
+    """Return {source column: number of codes whose usage disagrees with the fact table}."""
+    mismatches = {}
+    for table, column in DIMENSION_OF:
+        source = source_name(table, column)
+        stored = f"SELECT source, code, rows FROM dimension_usage WHERE source = '{source}'"
+        fresh = _fresh_usage(table, column)
+        bad = conn.execute(
+            f"""SELECT COUNT(*) FROM (
+                    SELECT * FROM ({stored} EXCEPT {fresh})
+                    UNION ALL
+                    SELECT * FROM ({fresh} EXCEPT {stored}))"""
+        ).fetchone()[0]
+        if bad:
+            mismatches[source] = bad
+    return mismatches
+
+
+def option_values(conn, table, column):
+    """Sorted values of `table`.`column` that at least one row uses."""
+    dim = DIMENSION_OF[(table, column)]
+    rows = conn.execute(
+        f"""SELECT d.Value FROM dimension_usage u JOIN {dim} d ON d.Code = u.code
+            WHERE u.source = ? ORDER BY d.Value""",
+        (source_name(table, column),),
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check or rebuild the filter dimension tables")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args(argv)
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        if args.rebuild:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild(conn)
+            # caches keyed on the old versions would keep serving the old dimensions
+            versions.bump(conn, sorted({table for table, _ in DIMENSION_OF}))
+            conn.commit()
+            print("dimensions rebuilt")
+        mismatches = check(conn)
+    finally:
+        conn.close()
+    for source, bad in mismatches.items():
+        print(f"{source}: {bad} inconsistent codes")
+    if mismatches:
+        print("run with --rebuild to recompute")
+        sys.exit(1)
+    print("dimensions consistent")
+
+
+if __name__ == "__main__":
+    main()
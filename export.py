@@ -0,0 +1,263 @@
+"""Streaming export of reports and filtered tables to CSV, NDJSON or Parquet.
+
+    python export.py --db food_data.db report 20 --format csv --gzip -o q20.csv.gz
+    python export.py --db food_data.db table claims Status=Pending --format parquet -o pending.parquet
+
+Rows are read from the cursor CHUNK_ROWS at a time with fetchmany and
+encoded chunk by chunk, so memory stays flat however large the result:
+nothing is loaded into pandas and no chunk outlives its encoding. CSV and
+NDJSON can be gzipped on the fly; Parquet writes one row group per chunk
+and uses its own gzip codec instead of an outer gzip layer. Its schema comes
+from the declared column types, so a later chunk can never disagree with it.
+"""
+import argparse
+import csv
+import io
+import json
+import sqlite3
+import sys
+import time
+import zlib
+
+from batch import PRIMARY_KEYS
+from filters import build_where, parse_id
+from migrations import TABLE_COLUMNS
+from reports import REPORT_IDS, SQL_QUERIES
+import search
+
+CHUNK_ROWS = 5_000
+
+# format -> (MIME type, file extension)
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def report_query(title):
+    """(sql, params) of a canned report."""
+    return SQL_QUERIES[title], []
+
+
+def table_query(table, where="", params=(), expression=None):
+    """(sql, params) of every row the Filter & Search page would show for these filters.
+
+    `expression` is a full-text search from search.match_expression; its
+    matches come best first, other rows in primary key order.
+    """
+    if expression:
+        return search.matches_query(table, expression, where, params)
+    return f"SELECT * FROM {table}{where} ORDER BY {PRIMARY_KEYS[table]}", list(params)
+
+
+def batches(conn, sql, params=(), chunk_rows=CHUNK_ROWS):
+    """Run `sql`; returns (column names, iterator of row lists of up to chunk_rows)."""
+    cursor = conn.execute(sql, params)
+    columns = [d[0] for d in cursor.description]
+
+    def fetch():
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
+
+    return columns, fetch()
+
+
+def _csv(columns, chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # header only: the result was empty
+        yield buffer.getvalue().encode()
+
+
+def _ndjson(columns, chunks):
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink that hands written bytes back out instead of keeping them."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def declared_types(conn):
+    """{column name: declared SQLite type} over the data tables; shared names have the same type."""
+    return {row[1]: row[2] for table in PRIMARY_KEYS for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _arrow_type(pa, declared):
+    """Arrow type for a declared column type, by SQLite's affinity rules; dates stay ISO text."""
+    declared = declared.upper()
+    if "INT" in declared:
+        return pa.int64()
+    if any(name in declared for name in ("REAL", "FLOA", "DOUB")):
+        return pa.float64()
+    return pa.string()
+
+
+def _parquet_schema(pa, columns, declared, rows):
+    """Table columns get their declared types; computed report columns are typed
+    from the first chunk, and all-NULL ones become strings."""
+    fields = []
+    for i, name in enumerate(columns):
+        if name in declared:
+            kind = _arrow_type(pa, declared[name])
+        else:
+            kind = pa.array([row[i] for row in rows]).type
+            if pa.types.is_null(kind):
+                kind = pa.string()
+        fields.append(pa.field(name, kind))
+    return pa.schema(fields)
+
+
+def _column(pa, rows, i, kind):
+    values = [row[i] for row in rows]
+    if pa.types.is_string(kind):  # TEXT affinity still lets a row hold a number
+        values = [None if v is None else str(v) for v in values]
+    return pa.array(values, type=kind)
+
+
+def _parquet(columns, chunks, compress, declared):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Drain()
+    writer = None
+    try:
+        for rows in chunks:
+            if writer is None:
+                schema = _parquet_schema(pa, columns, declared, rows)
+                writer = pq.ParquetWriter(sink, schema, compression="gzip" if compress else "snappy")
+            arrays = [_column(pa, rows, i, field.type) for i, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+        if writer is None:  # empty result
+            writer = pq.ParquetWriter(sink, _parquet_schema(pa, columns, declared, []))
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.take()
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks without holding more than one of them."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode(conn, sql, params=(), fmt="csv", compress=False, chunk_rows=CHUNK_ROWS):
+    """Iterator of byte chunks: the rows of `sql` as a `fmt` file, gzipped if `compress`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; use {', '.join(FORMATS)}")
+    columns, chunks = batches(conn, sql, params, chunk_rows)
+    if fmt == "parquet":
+        return _parquet(columns, chunks, compress, declared_types(conn))
+    body = _csv(columns, chunks) if fmt == "csv" else _ndjson(columns, chunks)
+    return gzip_chunks(body) if compress else body
+
+
+def file_name(base, fmt, compress=False):
+    """Download name, e.g. claims.csv.gz; Parquet compresses internally so keeps its extension."""
+    name = base + FORMATS[fmt][1]
+    return name + ".gz" if compress and fmt != "parquet" else name
+
+
+def mime_type(fmt, compress=False):
+    return "application/gzip" if compress and fmt != "parquet" else FORMATS[fmt][0]
+
+
+def write(f, chunks):
+    """Write byte chunks to a binary file object; returns the number of bytes written."""
+    size = 0
+    for chunk in chunks:
+        f.write(chunk)
+        size += len(chunk)
+    return size
+
+
+def main(argv=None):
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=FORMATS, default="csv")
+    output.add_argument("--gzip", action="store_true")
+    output.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    output.add_argument("-o", "--out", help="output file (default: stdout)")
+    parser = argparse.ArgumentParser(description="Stream a report or filtered table to a file")
+    parser.add_argument("--db", default="food_data.db")
+    sub = parser.add_subparsers(dest="source", required=True)
+    report = sub.add_parser("report", parents=[output], help="a canned report by number")
+    report.add_argument("id", choices=sorted(REPORT_IDS, key=int))
+    table = sub.add_parser("table", parents=[output], help="a table, filtered as on the Filter & Search page")
+    table.add_argument("table", choices=sorted(PRIMARY_KEYS))
+    table.add_argument("filters", nargs="*", metavar="COLUMN=VALUE")
+    table.add_argument("--search", default="", help="full-text search box text")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        if args.source == "report":
+            sql, params = report_query(REPORT_IDS[args.id])
+        else:
+            equals = {}
+            for item in args.filters:
+                column, _, value = item.partition("=")
+                if column not in TABLE_COLUMNS[args.table]:
+                    parser.error(f"{args.table} has no column {column!r}")
+                try:
+                    equals[column] = parse_id(value) if column.endswith("_ID") else value
+                except ValueError:
+                    parser.error(f"{column} must be a number, got {value!r}")
+            where, params = build_where(equals=equals)
+            expression = search.match_expression(conn, args.table, args.search) if args.search else None
+            sql, params = table_query(args.table, where, params, expression)
+        start = time.perf_counter()
+        chunks = encode(conn, sql, params, args.format, args.gzip, args.chunk_rows)
+        if args.out:
+            with open(args.out, "wb") as f:
+                size = write(f, chunks)
+        else:
+            size = write(sys.stdout.buffer, chunks)
+    finally:
+        conn.close()
+    print(f"exported {size:,} bytes in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
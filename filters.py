@@ -0,0 +1,72 @@
+"""Query helpers for the Filter & Search page.
+
+Widget values are turned into parameterized WHERE clauses so SQLite does the
+filtering and only the rows for the visible page are ever loaded into pandas.
+"""
+import pandas as pd
+
+import dimensions
+
+ALL = "All"
+PAGE_SIZE = 50
+
+
+def build_where(equals=None):
+    """Build a WHERE clause from the selected filters.
+
+    `equals` maps column -> value and skips "All"/empty values. Returns the
+    clause (with a leading space, or "") and its parameters.
+    """
+    clauses, params = [], []
+    for column, value in (equals or {}).items():
+        if value is None or value == "" or value == ALL:
+            continue
+        clauses.append(f"{column} = ?")
+        params.append(value)
+    if not clauses:
+        return "", []
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def parse_id(text):
+    """Parse an ID search box; returns None for empty input and raises ValueError on junk."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    return int(text)
+
+
+def count_rows(conn, table, where="", params=()):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}{where}", list(params)).fetchone()[0]
+
+
+def fetch_page(conn, table, order_by, where="", params=(), page=1, page_size=PAGE_SIZE):
+    offset = (max(page, 1) - 1) * page_size
+    sql = f"SELECT * FROM {table}{where} ORDER BY {order_by} LIMIT ? OFFSET ?"
+    return pd.read_sql_query(sql, conn, params=[*params, page_size, offset])
+
+
+def distinct_values(conn, table, column):
+    """Sorted option list for a selectbox, read from the index instead of the whole table."""
+    rows = conn.execute(
+        f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def table_count(cache, conn, table):
+    """COUNT(*) of a whole table, recomputed only after the table changes."""
+    return cache.get(conn, ("count", table), (table,), lambda c: count_rows(c, table))
+
+
+def option_values(cache, conn, table, column):
+    """Sorted option list for a selectbox, kept in `cache` until `table` changes.
+
+    Columns with a dimension table are read from it; the rest fall back to
+    distinct_values.
+    """
+    if (table, column) in dimensions.DIMENSION_OF:
+        build = lambda c: dimensions.option_values(c, table, column)
+    else:
+        build = lambda c: distinct_values(c, table, column)
+    return cache.get(conn, ("options", table, column), (table,), build)
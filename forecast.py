@@ -0,0 +1,372 @@
+"""Incremental forecasts of daily claim demand per city and meal type.
+
+    python forecast.py --db food_data.db                   # fold in new claims
+    python forecast.py --db food_data.db --rebuild         # recount and retrain
+    python forecast.py --db food_data.db --show "New Jessica"
+
+Claims are counted into daily buckets per (city, meal type) in
+`forecast_daily`. An insert trigger on `claims` queues every new Claim_ID
+in `forecast_new_claims`, whatever its value or the path that inserted it;
+an update adds only the queued claims to their buckets and empties the
+queue. It then trains the model with
+partial_fit on the days that closed since the last update. A day closes
+once it is over, so today and any future-dated claims wait for a later
+update.
+
+Features are built with numpy from a series x day matrix of bucket counts:
+the previous day, the 7-day mean and max, the weekday, and hashed
+city/meal identities. A closed day is trained on once, with the series that
+had claims on it or the day before. Only those series' last 7 days of
+buckets are loaded, so an update costs in proportion to the new days' data,
+not the full history.
+
+An update is split into fold (write), fit (read only) and save (write),
+so the app can train from a background thread (start_update) without
+holding the writer while it does.
+
+The series just trained on then get their next HORIZON_DAYS days predicted
+recursively into `forecast_predictions`, one row per city, day and meal
+type. Other series keep the predictions from when they were last active.
+`city_forecast` serves them from a VersionedCache keyed on the "forecast"
+version, which every training update bumps.
+
+Claims added late for a day that was already trained update its bucket,
+and so the lags of later days, but that day is not trained on again.
+Edited or deleted claims are not picked up incrementally; --rebuild
+recounts the buckets and retrains from scratch.
+"""
+import argparse
+import io
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.linear_model import SGDRegressor
+
+from migrations import migrate
+import versions
+
+WINDOW_DAYS = 7
+HORIZON_DAYS = 7
+HASH_FEATURES = 2 ** 14
+VERSION_KEY = "forecast"
+
+_hasher = FeatureHasher(n_features=HASH_FEATURES, input_type="string", alternate_sign=False)
+
+NEW_BUCKETS = """
+    SELECT IFNULL(f.Location, 'Unknown'), IFNULL(f.Meal_Type, 'Unknown'), DATE(c.Timestamp), COUNT(*)
+    FROM forecast_new_claims n
+    JOIN claims c ON c.Claim_ID = n.Claim_ID
+    LEFT JOIN food_listings f ON f.Food_ID = c.Food_ID
+    WHERE DATE(c.Timestamp) IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+
+def new_model():
+    return SGDRegressor(learning_rate="adaptive", eta0=0.01, alpha=1e-5, random_state=0)
+
+
+def _day(text):
+    return date.fromisoformat(text)
+
+
+def dump_model(model):
+    """The fitted SGD weights as .npz bytes: plain arrays, no pickled objects."""
+    buffer = io.BytesIO()
+    np.savez(buffer, coef=model.coef_, intercept=model.intercept_, t=np.float64(model.t_))
+    return buffer.getvalue()
+
+
+def load_model(blob):
+    """A model that predicts and continues partial_fit from dump_model() bytes."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+        model = new_model()
+        model.coef_ = arrays["coef"]
+        model.intercept_ = arrays["intercept"]
+        model.t_ = float(arrays["t"])
+    model.n_features_in_ = model.coef_.shape[0]
+    return model
+
+
+def _load_state(conn):
+    blob, trained_through = conn.execute(
+        "SELECT model, trained_through FROM forecast_model WHERE id = 1").fetchone()
+    return (load_model(blob) if blob else None), trained_through and _day(trained_through)
+
+
+def _save_state(conn, model, trained_through):
+    conn.execute(
+        "UPDATE forecast_model SET model = ?, trained_through = ?, updated_at = ? WHERE id = 1",
+        (dump_model(model) if model is not None else None, trained_through and trained_through.isoformat(),
+         datetime.now().isoformat(timespec="seconds")))
+
+
+_SERIES = "SELECT json_extract(value, '$[0]') AS City, json_extract(value, '$[1]') AS Meal_Type FROM json_each(?)"
+
+
+def _series_json(cities, meals):
+    return json.dumps([[c, m] for c, m in zip(cities, meals)])
+
+
+def series_between(conn, first_day, last_day):
+    """(cities, meals) of every series with claims between two days."""
+    rows = conn.execute(
+        "SELECT DISTINCT City, Meal_Type FROM forecast_daily WHERE Day BETWEEN ? AND ?",
+        (first_day.isoformat(), last_day.isoformat())).fetchall()
+    return [r[0] for r in rows], [r[1] for r in rows]
+
+
+def load_window(conn, cities, meals, first_day, last_day):
+    """Bucket counts of the given series between two days, as counts[series, day]."""
+    df = pd.read_sql_query(
+        f"""SELECT d.City, d.Meal_Type, d.Day, d.Claims
+            FROM ({_SERIES}) s
+            JOIN forecast_daily d ON d.City = s.City AND d.Meal_Type = s.Meal_Type
+            WHERE d.Day BETWEEN ? AND ?""",
+        conn, params=[_series_json(cities, meals), first_day.isoformat(), last_day.isoformat()])
+    counts = np.zeros((len(cities), (last_day - first_day).days + 1))
+    if not df.empty:
+        index = pd.MultiIndex.from_arrays([cities, meals])
+        rows = index.get_indexer(pd.MultiIndex.from_arrays([df["City"], df["Meal_Type"]]))
+        offsets = (pd.to_datetime(df["Day"]) - pd.Timestamp(first_day)).dt.days.to_numpy()
+        counts[rows, offsets] = df["Claims"].to_numpy()
+    return counts
+
+
+def hash_series(cities, meals):
+    """Sparse identity features of each (city, meal type) series."""
+    return _hasher.transform(
+        [f"city={c}", f"meal={m}", f"city_meal={c}|{m}"] for c, m in zip(cities, meals))
+
+
+def features(identity, history, day):
+    """Feature matrix for predicting `day` from each series' last WINDOW_DAYS counts."""
+    weekday = np.zeros((history.shape[0], 7))
+    weekday[:, day.weekday()] = 1
+    dense = np.column_stack([
+        np.log1p(history[:, -1]),
+        np.log1p(history.mean(axis=1)),
+        np.log1p(history.max(axis=1)),
+        weekday,
+    ])
+    return sparse.hstack([identity, sparse.csr_matrix(dense)], format="csr")
+
+
+def train(conn, model, first_day, last_day):
+    """partial_fit on every day from first_day to last_day.
+
+    A day's samples are the series with claims on it or on the day before,
+    so each day of history is trained on once and in proportion to its
+    claims. Returns (cities, meals, samples) for the series it trained.
+    """
+    cities, meals = series_between(conn, first_day - timedelta(days=1), last_day)
+    counts = load_window(conn, cities, meals, first_day - timedelta(days=WINDOW_DAYS), last_day)
+    identity = hash_series(cities, meals)
+    samples = 0
+    for t in range(WINDOW_DAYS, counts.shape[1]):
+        active = (counts[:, t - 1] > 0) | (counts[:, t] > 0)
+        if not active.any():
+            continue
+        day = first_day + timedelta(days=t - WINDOW_DAYS)
+        model.partial_fit(features(identity[active], counts[active, t - WINDOW_DAYS:t], day),
+                          np.log1p(counts[active, t]))
+        samples += int(active.sum())
+    return cities, meals, samples
+
+
+def predict(conn, model, cities, meals, through_day):
+    """(City, Day, Meal_Type, Claims) rows for the HORIZON_DAYS days after `through_day`."""
+    rows = []
+    if not cities:
+        return rows
+    history = load_window(conn, cities, meals, through_day - timedelta(days=WINDOW_DAYS - 1), through_day)
+    identity = hash_series(cities, meals)
+    for h in range(1, HORIZON_DAYS + 1):
+        day = through_day + timedelta(days=h)
+        predicted = np.clip(np.expm1(model.predict(features(identity, history, day))), 0, None)
+        rows += zip(cities, [day.isoformat()] * len(cities), meals, predicted.tolist())
+        history = np.column_stack([history[:, 1:], predicted])
+    return rows
+
+
+def last_closed_day(conn):
+    """Newest day with claims that is over, i.e. before today; None if there is none.
+
+    Claims dated today or later, including mistyped future timestamps, are
+    bucketed but not trained on until their day has passed.
+    """
+    last_day = conn.execute("SELECT MAX(Day) FROM forecast_daily WHERE Day < ?",
+                            (date.today().isoformat(),)).fetchone()[0]
+    return last_day and _day(last_day)
+
+
+def fold(conn):
+    """Add the queued new claims to their buckets and empty the queue; returns how many."""
+    new_claims = conn.execute("SELECT COUNT(*) FROM forecast_new_claims").fetchone()[0]
+    if new_claims:
+        conn.execute(
+            f"""INSERT INTO forecast_daily (City, Meal_Type, Day, Claims) {NEW_BUCKETS}
+                ON CONFLICT (City, Meal_Type, Day) DO UPDATE SET Claims = Claims + excluded.Claims""")
+        conn.execute("DELETE FROM forecast_new_claims")
+    return new_claims
+
+
+def fit(conn):
+    """Train on the days closed since the last update and predict, without writing.
+
+    Returns the result for save(), or None when no day has closed. Only
+    reads, so it can run on a read connection while the writer is free.
+    """
+    model, trained_through = _load_state(conn)
+    closed_through = last_closed_day(conn)
+    if closed_through is None:
+        return None
+    if trained_through is None:
+        first_day = _day(conn.execute("SELECT MIN(Day) FROM forecast_daily").fetchone()[0])
+    else:
+        first_day = trained_through + timedelta(days=1)
+    if first_day > closed_through:
+        return None
+    model = model or new_model()
+    cities, meals, samples = train(conn, model, first_day, closed_through)
+    return {"model": model, "after": trained_through, "through": closed_through,
+            "cities": cities, "meals": meals, "samples": samples,
+            "trained_days": (closed_through - first_day).days + 1,
+            "predictions": predict(conn, model, cities, meals, closed_through)}
+
+
+def save(conn, fitted):
+    """Store a fit() result in the caller's write transaction.
+
+    Returns False and stores nothing if another update has trained since
+    `fitted` was computed.
+    """
+    trained_through = conn.execute("SELECT trained_through FROM forecast_model WHERE id = 1").fetchone()[0]
+    if trained_through != (fitted["after"] and fitted["after"].isoformat()):
+        return False
+    conn.execute(
+        f"""DELETE FROM forecast_predictions
+            WHERE (City, Meal_Type) IN (SELECT City, Meal_Type FROM ({_SERIES}))""",
+        (_series_json(fitted["cities"], fitted["meals"]),))
+    conn.executemany("INSERT INTO forecast_predictions (City, Day, Meal_Type, Claims) VALUES (?, ?, ?, ?)",
+                     fitted["predictions"])
+    _save_state(conn, fitted["model"], fitted["through"])
+    versions.bump(conn, [VERSION_KEY])
+    return True
+
+
+def update(conn):
+    """Fold in new claims, train on newly closed days and refresh predictions.
+
+    Runs inside the caller's write transaction; returns what it did.
+    """
+    start = time.perf_counter()
+    stats = {"new_claims": fold(conn), "trained_days": 0, "samples": 0, "predictions": 0}
+    fitted = fit(conn)
+    if fitted is not None:
+        save(conn, fitted)
+        stats.update(trained_days=fitted["trained_days"], samples=fitted["samples"],
+                     predictions=len(fitted["predictions"]))
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+_updating = threading.Lock()
+
+
+def start_update(pool):
+    """Update from a background thread unless one is already running; returns whether it started.
+
+    The writer is taken only to fold the new claims and to store the
+    result; training runs on a read connection in between, so writes from
+    the app are not held up by it.
+    """
+    if not _updating.acquire(blocking=False):
+        return False
+    threading.Thread(target=_update_in_background, args=(pool,), name="forecast-update", daemon=True).start()
+    return True
+
+
+def _update_in_background(pool):
+    try:
+        pool.writes.submit((), fold).result()
+        fitted = fit(pool.reader())
+        if fitted is not None:
+            pool.writes.submit((), lambda conn: save(conn, fitted)).result()
+    finally:
+        _updating.release()
+
+
+def rebuild(conn):
+    """Drop the buckets, model and predictions and train again on the full history."""
+    conn.execute("DELETE FROM forecast_daily")
+    conn.execute("DELETE FROM forecast_predictions")
+    conn.execute("DELETE FROM forecast_new_claims")
+    conn.execute("INSERT INTO forecast_new_claims (Claim_ID) SELECT Claim_ID FROM claims")
+    _save_state(conn, None, None)
+    return update(conn)
+
+
+def pending(conn):
+    """True when new claims are queued or a day has closed since the last training."""
+    return conn.execute(
+        """SELECT EXISTS (SELECT 1 FROM forecast_new_claims)
+                  OR (SELECT MAX(Day) FROM forecast_daily WHERE Day < ?) > IFNULL(trained_through, '')
+           FROM forecast_model WHERE id = 1""",
+        (date.today().isoformat(),)).fetchone()[0] == 1
+
+
+_UPCOMING = "Day > (SELECT trained_through FROM forecast_model WHERE id = 1)"
+
+
+def forecast_cities(cache, conn):
+    """Cities with predictions for the days after the last trained one, sorted."""
+    sql = f"SELECT DISTINCT City FROM forecast_predictions WHERE {_UPCOMING} ORDER BY City"
+    return cache.get(conn, ("forecast", "cities"), (VERSION_KEY,), lambda c: [r[0] for r in c.execute(sql)])
+
+
+def city_forecast(cache, conn, city):
+    """Predicted claims for `city`: one row per day, one column per meal type."""
+    def build(c):
+        df = pd.read_sql_query(
+            f"""SELECT Day, Meal_Type, Claims FROM forecast_predictions
+                WHERE City = ? AND {_UPCOMING} ORDER BY Day""",
+            c, params=[city])
+        return df.pivot(index="Day", columns="Meal_Type", values="Claims").fillna(0)
+    return cache.get(conn, ("forecast", "city", city), (VERSION_KEY,), build)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the claim demand forecasts")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--show", metavar="CITY", help="print the cached predictions for a city")
+    args = parser.parse_args(argv)
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        migrate(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stats = rebuild(conn) if args.rebuild else update(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"{stats['new_claims']:,} new claims, {stats['trained_days']} days trained "
+              f"({stats['samples']:,} samples), {stats['predictions']:,} predictions "
+              f"in {stats['seconds']:.2f}s")
+        if args.show:
+            print(city_forecast(versions.VersionedCache(), conn, args.show).round(2).to_string())
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Bulk CSV -> SQLite loader for food_data.db.
+
+    python loader.py --db food_data.db --data-dir .                # full rebuild
+    python loader.py --db food_data.db --data-dir . --incremental  # apply deltas
+
+The four partner CSVs are streamed with the csv module (so quoted multi-line
+fields such as provider addresses survive), converted to the typed schema,
+and written with executemany, one transaction per chunk. Everything is loaded
+into a scratch database with durability switched off, indexes are built once
+the data is in (by running the migrations), and the result is copied over
+the target with SQLite's online backup API so open readers never see a
+half-built file.
+
+Incremental mode compares each CSV row with the hash recorded when it was
+last ingested and applies only the inserts, updates and deletes, using
+INSERT ... ON CONFLICT DO UPDATE. A per-file watermark (size, mtime and
+SHA-256) makes re-running on an unchanged file a no-op, and the
+`table_versions` counters of touched tables are bumped so caches refresh.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from dates import to_iso_date, to_iso_timestamp
+from migrations import TABLE_COLUMNS, create_ingest_tables, create_table, migrate
+import versions
+
+CHUNK_SIZE = 50_000
+
+# Load order: referenced tables before the tables that refer to them
+CSV_FILES = {
+    "providers": "providers_data.csv",
+    "receivers": "receivers_data.csv",
+    "food_listings": "food_listings_data.csv",
+    "claims": "claims_data.csv",
+}
+
+# PRAGMAs for the scratch database; it is thrown away if the load fails
+LOAD_PRAGMAS = [
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",  # 256 MiB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA locking_mode = EXCLUSIVE",
+]
+
+
+def _text(value):
+    return value if value != "" else None
+
+
+def _int(value):
+    return int(value) if value != "" else None
+
+
+CONVERTERS = {
+    "providers": [int, _text, _text, _text, _text, _text],
+    "receivers": [int, _text, _text, _text, _text],
+    "food_listings": [int, _text, _int, to_iso_date, _int, _text, _text, _text, _text],
+    "claims": [int, _int, _int, _text, to_iso_timestamp],
+}
+
+
+def read_rows(path, table):
+    """Yield (line_number, converted_row or None, error) for every CSV record."""
+    converters = CONVERTERS[table]
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header != TABLE_COLUMNS[table]:
+            raise ValueError(f"{path}: expected columns {TABLE_COLUMNS[table]}, got {header}")
+        for row in reader:
+            line = reader.line_num
+            if len(row) != len(converters):
+                yield line, None, f"expected {len(converters)} fields, got {len(row)}"
+                continue
+            try:
+                yield line, tuple(conv(value) for conv, value in zip(converters, row)), None
+            except ValueError as e:
+                yield line, None, str(e)
+
+
+def read_chunks(path, table, chunk_size=CHUNK_SIZE, rejected=None):
+    """Group converted rows into lists of `chunk_size`; bad rows go to `rejected`."""
+    chunk = []
+    for line, row, error in read_rows(path, table):
+        if row is None:
+            if rejected is not None:
+                rejected.append((line, error))
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def insert_sql(table, verb="INSERT"):
+    columns = TABLE_COLUMNS[table]
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def upsert_sql(table):
+    columns = TABLE_COLUMNS[table]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+    return f"{insert_sql(table)} ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}"
+
+
+HASH_UPSERT = """INSERT INTO ingest_row_hashes (table_name, pk, hash) VALUES (?, ?, ?)
+                 ON CONFLICT (table_name, pk) DO UPDATE SET hash = excluded.hash"""
+
+
+def row_hash(row):
+    digest = hashlib.blake2b(repr(row).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def load_table(conn, table, path, chunk_size=CHUNK_SIZE):
+    """Stream one CSV into `table`; returns (rows loaded, rejected rows, seconds)."""
+    sql = insert_sql(table)
+    rejected = []
+    loaded = 0
+    start = time.perf_counter()
+    for chunk in read_chunks(path, table, chunk_size, rejected):
+        conn.execute("BEGIN")
+        conn.executemany(sql, chunk)
+        conn.executemany(HASH_UPSERT, [(table, row[0], row_hash(row)) for row in chunk])
+        conn.commit()
+        loaded += len(chunk)
+    return loaded, rejected, time.perf_counter() - start
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def save_watermark(conn, table, path, digest=None):
+    stat = os.stat(path)
+    conn.execute(
+        """INSERT OR REPLACE INTO ingest_watermarks
+           (table_name, source, size, mtime_ns, sha256, ingested_at)
+           VALUES (?, ?, ?, ?, ?, datetime('now'))""",
+        (table, os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest or file_digest(path)),
+    )
+
+
+def unchanged_since_watermark(conn, table, path):
+    """True when `path` is the file last ingested into `table`.
+
+    Size and mtime are checked first so the common case never reads the
+    file; a touched-but-identical file is caught by the SHA-256.
+    Returns (unchanged, digest) where digest is None if it was not computed.
+    """
+    row = conn.execute(
+        "SELECT size, mtime_ns, sha256 FROM ingest_watermarks WHERE table_name = ?", (table,)
+    ).fetchone()
+    if row is None:
+        return False, None
+    stat = os.stat(path)
+    if (stat.st_size, stat.st_mtime_ns) == (row[0], row[1]):
+        return True, None
+    digest = file_digest(path)
+    return digest == row[2], digest
+
+
+def ingest_table(conn, table, path, chunk_size=CHUNK_SIZE):
+    """Apply the differences between `path` and the last ingest of `table`.
+
+    Returns a dict of counts, or None when the watermark shows no change.
+    Only rows previously loaded from the CSV are candidates for deletion;
+    records added through the app are left alone. If any line is rejected,
+    nothing is deleted and the watermark is not advanced.
+    """
+    unchanged, digest = unchanged_since_watermark(conn, table, path)
+    if unchanged:
+        if digest is not None:
+            # same content, new mtime: refresh the stat part of the watermark
+            with conn:
+                save_watermark(conn, table, path, digest)
+        return None
+
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "rejected": []}
+    upsert = upsert_sql(table)
+    conn.execute("DROP TABLE IF EXISTS temp.ingest_seen")
+    conn.execute("CREATE TEMP TABLE ingest_seen (pk INTEGER PRIMARY KEY)")
+    for chunk in read_chunks(path, table, chunk_size, counts["rejected"]):
+        hashes = {row[0]: row_hash(row) for row in chunk}
+        stored = dict(conn.execute(
+            """SELECT pk, hash FROM ingest_row_hashes
+               WHERE table_name = ? AND pk IN (SELECT value FROM json_each(?))""",
+            (table, json.dumps(list(hashes))),
+        ).fetchall())
+        changed = [row for row in chunk if stored.get(row[0]) != hashes[row[0]]]
+        for row in changed:
+            counts["updated" if row[0] in stored else "inserted"] += 1
+        counts["unchanged"] += len(chunk) - len(changed)
+
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR IGNORE INTO temp.ingest_seen (pk) VALUES (?)",
+                         [(pk,) for pk in hashes])
+        if changed:
+            conn.executemany(upsert, changed)
+            conn.executemany(HASH_UPSERT, [(table, row[0], hashes[row[0]]) for row in changed])
+        conn.commit()
+
+    pk_column = TABLE_COLUMNS[table][0]
+    conn.execute("BEGIN")
+    # a rejected line's key never reaches ingest_seen, so with rejects the
+    # delete pass would drop rows that are still in the file; skip it, and
+    # leave the watermark so the next run reads the file again
+    if not counts["rejected"]:
+        gone = """SELECT pk FROM ingest_row_hashes
+                  WHERE table_name = ? AND pk NOT IN (SELECT pk FROM temp.ingest_seen)"""
+        counts["deleted"] = conn.execute(
+            f"DELETE FROM {table} WHERE {pk_column} IN ({gone})", (table,)
+        ).rowcount
+        conn.execute(
+            f"DELETE FROM ingest_row_hashes WHERE table_name = ? AND pk IN ({gone})", (table, table)
+        )
+        save_watermark(conn, table, path, digest)
+    if counts["inserted"] or counts["updated"] or counts["deleted"]:
+        versions.bump(conn, [table])
+    conn.commit()
+    conn.execute("DROP TABLE temp.ingest_seen")
+    return counts
+
+
+def report(table, loaded, rejected, seconds, out=sys.stdout):
+    rate = loaded / seconds if seconds else float("inf")
+    print(f"{table:<14} {loaded:>10,} rows  {seconds:8.2f}s  {rate:>12,.0f} rows/s", file=out)
+    for line, error in rejected[:5]:
+        print(f"    rejected line {line}: {error}", file=out)
+    if len(rejected) > 5:
+        print(f"    ... {len(rejected) - 5} more rejected rows", file=out)
+
+
+def build_database(db_path, data_dir=".", chunk_size=CHUNK_SIZE, out=sys.stdout):
+    """Rebuild `db_path` from the CSVs in `data_dir`."""
+    scratch = db_path + ".loading"
+    if os.path.exists(scratch):
+        os.remove(scratch)
+    total_start = time.perf_counter()
+    conn = sqlite3.connect(scratch)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        for table in CSV_FILES:
+            create_table(conn, table)
+        create_ingest_tables(conn)
+        conn.commit()
+        total = 0
+        clean = []
+        for table, filename in CSV_FILES.items():
+            loaded, rejected, seconds = load_table(conn, table, os.path.join(data_dir, filename), chunk_size)
+            report(table, loaded, rejected, seconds, out)
+            total += loaded
+            if not rejected:
+                clean.append(table)
+        with conn:
+            for table in clean:
+                save_watermark(conn, table, os.path.join(data_dir, CSV_FILES[table]))
+
+        index_start = time.perf_counter()
+        migrate(conn)
+        print(f"indexes built in {time.perf_counter() - index_start:.2f}s", file=out)
+
+        target = sqlite3.connect(db_path)
+        # carry the change counters forward so caches built on the old
+        # contents can never match the rebuilt database
+        with conn:
+            old = _old_versions(target)
+            versions.bump(conn, versions.DATA_TABLES)
+            conn.executemany("UPDATE table_versions SET version = version + ? WHERE table_name = ?",
+                             [(v, t) for t, v in old.items()])
+        conn.backup(target)
+        target.close()
+    finally:
+        conn.close()
+        if os.path.exists(scratch):
+            os.remove(scratch)
+    seconds = time.perf_counter() - total_start
+    print(f"total {total:,} rows in {seconds:.2f}s ({total / seconds:,.0f} rows/s)", file=out)
+    return total
+
+
+def _old_versions(conn):
+    try:
+        return versions.current(conn)
+    except sqlite3.OperationalError:
+        return {}
+
+
+def ingest_incremental(db_path, data_dir=".", chunk_size=CHUNK_SIZE, out=sys.stdout):
+    """Apply only the changed rows of each CSV to an existing `db_path`."""
+    if not os.path.exists(db_path):
+        return build_database(db_path, data_dir, chunk_size, out)
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        migrate(conn)
+        for table, filename in CSV_FILES.items():
+            start = time.perf_counter()
+            counts = ingest_table(conn, table, os.path.join(data_dir, filename), chunk_size)
+            seconds = time.perf_counter() - start
+            if counts is None:
+                print(f"{table:<14} unchanged since last ingest", file=out)
+                continue
+            print(f"{table:<14} +{counts['inserted']:,} ~{counts['updated']:,} -{counts['deleted']:,} "
+                  f"({counts['unchanged']:,} unchanged)  {seconds:.2f}s", file=out)
+            for line, error in counts["rejected"][:5]:
+                print(f"    rejected line {line}: {error}", file=out)
+            if counts["rejected"]:
+                print(f"    {len(counts['rejected']):,} rejected rows: deletions skipped", file=out)
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the partner CSVs into food_data.db")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--incremental", action="store_true",
+                        help="apply only inserts/updates/deletes since the last ingest")
+    args = parser.parse_args(argv)
+    if args.incremental:
+        ingest_incremental(args.db, args.data_dir, args.chunk_size)
+    else:
+        build_database(args.db, args.data_dir, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
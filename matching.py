@@ -0,0 +1,148 @@
+"""Batch matching of open food listings to receivers.
+
+    python matching.py --db food_data.db            # propose and insert claims
+    python matching.py --db food_data.db --dry-run  # only report the allocation
+
+Open listings (not expired, not already claimed) are taken in order of
+earliest expiry, which the Expiry_Date index returns pre-sorted. Receivers are
+grouped by city into max-heaps keyed on their remaining capacity, so each
+listing goes to the receiver in its Location with the most room left, in
+O(log receivers) time. A listing is claimed whole, since claims carry no
+quantity; listings nobody in their city can take stay open. Proposed claims
+are written as 'Pending' with one executemany per chunk.
+
+A run reads the open listings and pending loads and inserts its claims in
+one BEGIN IMMEDIATE transaction, so no other writer (another run, or a claim
+made on the CRUD page) can change them in between, and a failed run leaves
+nothing behind.
+"""
+import argparse
+import heapq
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+from dates import to_iso_date, to_iso_timestamp
+import versions
+
+# Quantity a receiver can take per run, by receiver Type
+CAPACITY = {
+    "Individual": 20,
+    "Shelter": 200,
+    "Charity": 300,
+    "NGO": 500,
+}
+DEFAULT_CAPACITY = 50
+CHUNK_SIZE = 10_000
+
+OPEN_LISTINGS = """
+    SELECT f.Food_ID, f.Quantity, f.Expiry_Date, f.Location
+    FROM food_listings f
+    WHERE f.Expiry_Date >= ?
+      AND f.Quantity > 0
+      AND NOT EXISTS (SELECT 1 FROM claims c
+                      WHERE c.Food_ID = f.Food_ID AND c.Status IN ('Pending', 'Completed'))
+    ORDER BY f.Expiry_Date, f.Food_ID
+"""
+
+# Quantity already promised to each receiver through pending claims
+PENDING_LOAD = """
+    SELECT c.Receiver_ID, SUM(f.Quantity)
+    FROM claims c
+    JOIN food_listings f ON c.Food_ID = f.Food_ID
+    WHERE c.Status = 'Pending'
+    GROUP BY c.Receiver_ID
+"""
+
+
+def receiver_heaps(receivers, pending=None, capacity=CAPACITY):
+    """Group (Receiver_ID, City, Type) rows into per-city max-heaps of remaining capacity."""
+    pending = pending or {}
+    heaps = defaultdict(list)
+    for receiver_id, city, receiver_type in receivers:
+        room = capacity.get(receiver_type, DEFAULT_CAPACITY) - pending.get(receiver_id, 0)
+        if room > 0:
+            heaps[city].append((-room, receiver_id))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+    return heaps
+
+
+def allocate(listings, heaps):
+    """Yield (Food_ID, Receiver_ID) for listings taken in the given (expiry) order.
+
+    `listings` are (Food_ID, Quantity, Expiry_Date, Location) rows and
+    `heaps` comes from receiver_heaps(); it is consumed as capacity is used.
+    """
+    for food_id, quantity, _expiry, city in listings:
+        heap = heaps.get(city)
+        if not heap:
+            continue
+        room, receiver_id = heap[0]
+        if -room < quantity:
+            continue  # even the emptiest receiver in this city cannot take it
+        room += quantity
+        if room < 0:
+            heapq.heapreplace(heap, (room, receiver_id))
+        else:
+            heapq.heappop(heap)
+        yield food_id, receiver_id
+
+
+def propose_claims(conn, today=None, capacity=CAPACITY):
+    """Return the list of (Food_ID, Receiver_ID) pairs the current data allows."""
+    today = to_iso_date(today or date.today())
+    receivers = conn.execute("SELECT Receiver_ID, City, Type FROM receivers")
+    pending = dict(conn.execute(PENDING_LOAD).fetchall())
+    heaps = receiver_heaps(receivers, pending, capacity)
+    return list(allocate(conn.execute(OPEN_LISTINGS, (today,)), heaps))
+
+
+def insert_claims(conn, pairs, timestamp=None, chunk_size=CHUNK_SIZE):
+    """Bulk insert `pairs` as Pending claims in the caller's transaction, one executemany per chunk."""
+    timestamp = to_iso_timestamp(timestamp or datetime.now())
+    sql = "INSERT INTO claims (Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, 'Pending', ?)"
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        conn.executemany(sql, [(food_id, receiver_id, timestamp) for food_id, receiver_id in chunk])
+    return len(pairs)
+
+
+def match(conn, today=None, capacity=CAPACITY):
+    """Propose and insert claims in one write transaction; returns the inserted pairs."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        pairs = propose_claims(conn, today, capacity)
+        if pairs:
+            insert_claims(conn, pairs)
+            versions.bump(conn, ["claims"])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match open food listings to receivers")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--today", help="treat this date (YYYY-MM-DD) as today")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        start = time.perf_counter()
+        if args.dry_run:
+            pairs = propose_claims(conn, args.today)
+            print(f"proposed {len(pairs):,} claims in {time.perf_counter() - start:.2f}s")
+        else:
+            pairs = match(conn, args.today)
+            print(f"inserted {len(pairs):,} claims in {time.perf_counter() - start:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""Versioned schema migrations for food_data.db.
+
+Every migration runs once, in order, in its own transaction. The applied
+version is stored in PRAGMA user_version, so calling `migrate()` on every app
+start costs a single pragma read once the database is current.
+"""
+import logging
+import sqlite3
+
+from dates import to_iso_date, to_iso_timestamp
+import dimensions
+import search
+import summaries
+
+log = logging.getLogger(__name__)
+
+# Final column layout of the typed tables (see migration 2). There are no
+# REFERENCES clauses: connections never turn on PRAGMA foreign_keys, and
+# claims must outlive their listing when the sweeper archives it. References
+# are checked by the application instead (batch.py). Databases migrated
+# before this still carry the clauses, which SQLite ignores.
+TABLE_DDL = {
+    "providers": """
+        CREATE TABLE {name} (
+            Provider_ID INTEGER PRIMARY KEY,
+            Name TEXT,
+            Type TEXT,
+            Address TEXT,
+            City TEXT,
+            Contact TEXT
+        )""",
+    "receivers": """
+        CREATE TABLE {name} (
+            Receiver_ID INTEGER PRIMARY KEY,
+            Name TEXT,
+            Type TEXT,
+            City TEXT,
+            Contact TEXT
+        )""",
+    "food_listings": """
+        CREATE TABLE {name} (
+            Food_ID INTEGER PRIMARY KEY,
+            Food_Name TEXT,
+            Quantity INTEGER,
+            Expiry_Date DATE,
+            Provider_ID INTEGER,
+            Provider_Type TEXT,
+            Location TEXT,
+            Food_Type TEXT,
+            Meal_Type TEXT
+        )""",
+    "claims": """
+        CREATE TABLE {name} (
+            Claim_ID INTEGER PRIMARY KEY,
+            Food_ID INTEGER,
+            Receiver_ID INTEGER,
+            Status TEXT,
+            Timestamp DATETIME
+        )""",
+}
+
+TABLE_COLUMNS = {
+    "providers": ["Provider_ID", "Name", "Type", "Address", "City", "Contact"],
+    "receivers": ["Receiver_ID", "Name", "Type", "City", "Contact"],
+    "food_listings": ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                      "Provider_Type", "Location", "Food_Type", "Meal_Type"],
+    "claims": ["Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp"],
+}
+
+# Secondary indexes; dropped together with their table on a rebuild
+INDEXES = {
+    "food_listings": [
+        """CREATE INDEX IF NOT EXISTS idx_food_listings_filters
+           ON food_listings (Location, Provider_Type, Food_Type, Meal_Type)""",
+        # covers the provider joins + SUM(Quantity) of reports 13, 17, 21, 24
+        """CREATE INDEX IF NOT EXISTS idx_food_listings_provider
+           ON food_listings (Provider_ID, Quantity)""",
+        # range scans for expired/expiring listings (report 14)
+        """CREATE INDEX IF NOT EXISTS idx_food_listings_expiry
+           ON food_listings (Expiry_Date)""",
+    ],
+    "claims": [
+        """CREATE INDEX IF NOT EXISTS idx_claims_filters
+           ON claims (Status, Receiver_ID, Food_ID)""",
+        """CREATE INDEX IF NOT EXISTS idx_claims_food
+           ON claims (Food_ID, Status)""",
+        """CREATE INDEX IF NOT EXISTS idx_claims_receiver
+           ON claims (Receiver_ID, Food_ID)""",
+        # day buckets for the claims trend (report 18)
+        """CREATE INDEX IF NOT EXISTS idx_claims_day
+           ON claims (date(Timestamp))""",
+    ],
+}
+
+
+# Bookkeeping for incremental ingest and cache invalidation
+INGEST_DDL = [
+    """CREATE TABLE IF NOT EXISTS ingest_row_hashes (
+           table_name TEXT NOT NULL,
+           pk INTEGER NOT NULL,
+           hash INTEGER NOT NULL,
+           PRIMARY KEY (table_name, pk)
+       ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS ingest_watermarks (
+           table_name TEXT PRIMARY KEY,
+           source TEXT,
+           size INTEGER,
+           mtime_ns INTEGER,
+           sha256 TEXT,
+           ingested_at TEXT
+       )""",
+    # bumped by every writer; caches key on it to know what went stale
+    """CREATE TABLE IF NOT EXISTS table_versions (
+           table_name TEXT PRIMARY KEY,
+           version INTEGER NOT NULL DEFAULT 0
+       )""",
+    """INSERT OR IGNORE INTO table_versions (table_name)
+       VALUES ('providers'), ('receivers'), ('food_listings'), ('claims')""",
+]
+
+
+def create_table(conn, table, name=None):
+    conn.execute(TABLE_DDL[table].format(name=name or table))
+
+
+ARCHIVE_DDL = [
+    """CREATE TABLE IF NOT EXISTS food_listings_archive (
+           Food_ID INTEGER PRIMARY KEY,
+           Food_Name TEXT,
+           Quantity INTEGER,
+           Expiry_Date DATE,
+           Provider_ID INTEGER,
+           Provider_Type TEXT,
+           Location TEXT,
+           Food_Type TEXT,
+           Meal_Type TEXT,
+           Archived_At DATETIME
+       )""",
+    """CREATE INDEX IF NOT EXISTS idx_food_listings_archive_expiry
+       ON food_listings_archive (Expiry_Date)""",
+]
+
+
+# Daily claim buckets, model state and cached predictions for forecast.py
+FORECAST_DDL = [
+    """CREATE TABLE IF NOT EXISTS forecast_daily (
+           City TEXT NOT NULL,
+           Meal_Type TEXT NOT NULL,
+           Day TEXT NOT NULL,
+           Claims INTEGER NOT NULL,
+           PRIMARY KEY (City, Meal_Type, Day)
+       ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_forecast_daily_day ON forecast_daily(Day)",
+    """CREATE TABLE IF NOT EXISTS forecast_predictions (
+           City TEXT NOT NULL,
+           Day TEXT NOT NULL,
+           Meal_Type TEXT NOT NULL,
+           Claims REAL NOT NULL,
+           PRIMARY KEY (City, Day, Meal_Type)
+       ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS forecast_model (
+           id INTEGER PRIMARY KEY CHECK (id = 1),
+           model BLOB,
+           claim_watermark INTEGER NOT NULL DEFAULT 0,
+           trained_through TEXT,
+           updated_at TEXT
+       )""",
+    "INSERT OR IGNORE INTO forecast_model (id) VALUES (1)",
+]
+
+# Every new claim, however it was inserted and whatever its Claim_ID, is
+# queued here until forecast.fold() adds it to the daily buckets.
+FORECAST_QUEUE_DDL = [
+    "CREATE TABLE IF NOT EXISTS forecast_new_claims (Claim_ID INTEGER PRIMARY KEY)",
+    """CREATE TRIGGER IF NOT EXISTS trg_claims_forecast_insert AFTER INSERT ON claims BEGIN
+           INSERT INTO forecast_new_claims (Claim_ID)
+               SELECT NEW.Claim_ID
+               WHERE NOT EXISTS (SELECT 1 FROM forecast_new_claims WHERE Claim_ID = NEW.Claim_ID);
+       END""",
+]
+
+
+def create_ingest_tables(conn):
+    for ddl in INGEST_DDL:
+        conn.execute(ddl)
+
+
+def create_indexes(conn, table):
+    for ddl in INDEXES.get(table, []):
+        conn.execute(ddl)
+
+
+def _declared_types(conn, table):
+    return {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _tables(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _m1_filter_indexes(conn):
+    if not {"food_listings", "claims"} <= _tables(conn):
+        return  # fresh database: migration 2 creates the tables with all indexes
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_food_listings_filters
+                    ON food_listings (Location, Provider_Type, Food_Type, Meal_Type)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_claims_filters
+                    ON claims (Status, Receiver_ID, Food_ID)""")
+
+
+def _m2_typed_keys(conn):
+    # The notebook created the ID/quantity columns as TEXT, so every join
+    # compared text to INTEGER PRIMARY KEY and could not use an index.
+    for table in TABLE_DDL:
+        if table not in _tables(conn):
+            create_table(conn, table)
+        else:
+            wanted = sqlite3.connect(":memory:")
+            create_table(wanted, table)
+            if _declared_types(conn, table) != _declared_types(wanted, table):
+                columns = ", ".join(TABLE_COLUMNS[table])
+                create_table(conn, table, name=f"{table}_new")
+                conn.execute(f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {table}")
+                conn.execute(f"DROP TABLE {table}")
+                conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            wanted.close()
+        create_indexes(conn, table)
+
+
+def _keep_unparsable(convert, failures):
+    """`convert`, but a value it rejects is returned unchanged and counted in `failures`."""
+    def lenient(value):
+        try:
+            return convert(value)
+        except ValueError:
+            failures.append(value)
+            return value
+    return lenient
+
+
+def _m3_iso_dates(conn):
+    # The CSVs carry US-style dates, which sort wrongly and make DATE()
+    # return NULL; rewrite them as ISO-8601 and index them. A value that is
+    # not a date is left as it is: one bad row must not stop the app starting.
+    for table, column, convert in (("food_listings", "Expiry_Date", to_iso_date),
+                                   ("claims", "Timestamp", to_iso_timestamp)):
+        failures = []
+        conn.create_function("iso_or_keep", 1, _keep_unparsable(convert, failures))
+        conn.execute(f"UPDATE {table} SET {column} = iso_or_keep({column}) WHERE {column} LIKE '%/%'")
+        if failures:
+            log.warning("%s.%s: %d values are not dates and were left unchanged, e.g. %r",
+                        table, column, len(failures), failures[0])
+    create_indexes(conn, "food_listings")
+    create_indexes(conn, "claims")
+
+
+def _m4_ingest_tracking(conn):
+    create_ingest_tables(conn)
+
+
+def _m5_summaries(conn):
+    summaries.install(conn)
+
+
+def _m6_search(conn):
+    search.install(conn)
+
+
+def _m7_listing_archive(conn):
+    for ddl in ARCHIVE_DDL:
+        conn.execute(ddl)
+
+
+def _m8_dimensions(conn):
+    dimensions.install(conn)
+
+
+def _m9_forecast(conn):
+    for ddl in FORECAST_DDL:
+        conn.execute(ddl)
+
+
+def _m10_dimension_triggers(conn):
+    # the first triggers used INSERT OR IGNORE, which an outer UPSERT overrides
+    dimensions.drop_triggers(conn)
+    dimensions.install(conn)
+
+
+def _m11_forecast_queue(conn):
+    # A Claim_ID watermark missed claims loaded with lower IDs, and the model
+    # was stored as a pickle; queue every claim and train from scratch.
+    for ddl in FORECAST_QUEUE_DDL:
+        conn.execute(ddl)
+    conn.execute("ALTER TABLE forecast_model DROP COLUMN claim_watermark")
+    conn.execute("DELETE FROM forecast_daily")
+    conn.execute("DELETE FROM forecast_predictions")
+    conn.execute("UPDATE forecast_model SET model = NULL, trained_through = NULL, updated_at = NULL")
+    conn.execute("INSERT INTO forecast_new_claims (Claim_ID) SELECT Claim_ID FROM claims")
+
+
+MIGRATIONS = [
+    (1, "indexes for Filter & Search", _m1_filter_indexes),
+    (2, "INTEGER keys/quantity and join indexes", _m2_typed_keys),
+    (3, "ISO-8601 Expiry_Date/Timestamp with date indexes", _m3_iso_dates),
+    (4, "row hashes, watermarks and table versions for incremental ingest", _m4_ingest_tracking),
+    (5, "trigger-maintained KPI summary tables", _m5_summaries),
+    (6, "FTS5 name search indexes", _m6_search),
+    (7, "archive table for expired listings", _m7_listing_archive),
+    (8, "dimension tables for filter option lists", _m8_dimensions),
+    (9, "claim demand forecast state", _m9_forecast),
+    (10, "dimension triggers safe under UPSERT", _m10_dimension_triggers),
+    (11, "forecast claim queue and pickle-free model state", _m11_forecast_queue),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply all pending migrations; safe to call on every start."""
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return []
+    applied = []
+    for version, description, apply in MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # re-check under the write lock in case another session migrated first
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+    return applied
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--db", default="food_data.db")
+    args = parser.parse_args()
+    with sqlite3.connect(args.db) as conn:
+        for version, description in migrate(conn):
+            print(f"applied {version}: {description}")
+        print(f"schema version {schema_version(conn)}")
@@ -0,0 +1,286 @@
+"""Query and rerun profiling for the Streamlit app.
+
+Connections created with `Profiler.connect` (the pool does this when given a
+profiler) time every execute/executemany and the fetches that follow, which
+covers pd.read_sql_query as well since pandas goes through a cursor. Each
+distinct statement is run once through EXPLAIN QUERY PLAN, and plans that
+scan a table without an index are flagged.
+
+The app brackets every rerun with start_rerun()/end_rerun(), so queries are
+attributed to the page (app_mode) that issued them and the page's total
+rerun time is recorded. Finished reruns and their queries are appended to a
+size-rotated JSONL log; recent ones stay in memory for the admin page.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+LOG_PATH = os.path.join("logs", "profile.jsonl")
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+SLOW_MS = 100
+KEEP_RECENT = 500
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# "SCAN t" is a full table scan; "SCAN t USING [COVERING] INDEX i", virtual
+# tables (FTS), subqueries and constant rows are not
+_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(\S+)(?!.*\bUSING\b)(?!.*VIRTUAL TABLE)")
+
+
+def normalize(sql):
+    return " ".join(sql.split())
+
+
+def full_scans(plan):
+    """Tables read by a full scan in an EXPLAIN QUERY PLAN listing."""
+    return [m.group(1) for _, detail in plan if (m := _FULL_SCAN.match(detail))]
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and the rows fetched from it."""
+
+    _record = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record = self.connection.profiler.begin(
+                self.connection, sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        rows = 0
+        try:
+            if not isinstance(seq_of_parameters, (list, tuple)):
+                seq_of_parameters = list(seq_of_parameters)
+            rows = len(seq_of_parameters)
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record = self.connection.profiler.begin(
+                self.connection, sql, None, time.perf_counter() - start, rows)
+            self._finish()
+
+    def _fetched(self, rows, seconds, exhausted):
+        record = self._record
+        if record is not None:
+            record["rows"] += rows
+            record["ms"] += seconds * 1000
+            if exhausted:
+                self._finish()
+
+    def _finish(self):
+        if self._record is not None:
+            self.connection.profiler.finish(self._record)
+            self._record = None
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(row is not None, time.perf_counter() - start, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), time.perf_counter() - start, not rows)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), time.perf_counter() - start, True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(0, time.perf_counter() - start, True)
+            raise
+        self._fetched(1, time.perf_counter() - start, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors, and execute shortcuts, are profiled."""
+
+    profiler = None
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    # Connection.execute would otherwise create a plain sqlite3.Cursor
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class Profiler:
+    """Collects query and rerun timings; one per process (st.cache_resource)."""
+
+    def __init__(self, log_path=LOG_PATH, max_bytes=MAX_LOG_BYTES, backups=LOG_BACKUPS,
+                 slow_ms=SLOW_MS, keep=KEEP_RECENT):
+        self.slow_ms = slow_ms
+        self.connection_class = type("ProfiledConnection", (ProfiledConnection,), {"profiler": self})
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._plans = {}
+        self._queries = {}
+        self._pages = {}
+        self.recent_queries = deque(maxlen=keep)
+        self.recent_reruns = deque(maxlen=keep)
+        self._log = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups,
+                                          encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log = logging.getLogger(f"{__name__}.{id(self)}")
+            self._log.propagate = False
+            self._log.setLevel(logging.INFO)
+            self._log.addHandler(handler)
+
+    def connect(self, *args, **kwargs):
+        """sqlite3.connect with profiled connections."""
+        return sqlite3.connect(*args, factory=self.connection_class, **kwargs)
+
+    # -- queries ------------------------------------------------------------
+
+    def _plan(self, conn, sql, parameters):
+        key = normalize(sql)
+        if key not in self._plans:
+            plan = []
+            if key.upper().startswith(EXPLAINABLE) and parameters is not None:
+                try:
+                    # a plain cursor, so the EXPLAIN itself is not profiled
+                    cursor = sqlite3.Cursor(conn)
+                    plan = [(row[0], row[3]) for row in
+                            cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()]
+                    cursor.close()
+                except sqlite3.Error:
+                    plan = []
+            self._plans[key] = plan
+        return self._plans[key]
+
+    def begin(self, conn, sql, parameters, seconds, rows=0):
+        """Start the record for a statement that took `seconds` to execute."""
+        plan = self._plan(conn, sql, parameters)
+        record = {
+            "type": "query",
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "page": getattr(self._local, "page", None),
+            "sql": normalize(sql),
+            "ms": seconds * 1000,
+            "rows": rows,
+            "full_scan": full_scans(plan),
+            "plan": [detail for _, detail in plan],
+        }
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(record)
+        return record
+
+    def finish(self, record):
+        """Fold a completed statement into the per-statement totals."""
+        if record.get("done"):
+            return
+        record["done"] = True
+        with self._lock:
+            stats = self._queries.setdefault(record["sql"], {
+                "calls": 0, "ms": 0.0, "max_ms": 0.0, "rows": 0,
+                "full_scan": record["full_scan"], "plan": record["plan"],
+            })
+            stats["calls"] += 1
+            stats["ms"] += record["ms"]
+            stats["max_ms"] = max(stats["max_ms"], record["ms"])
+            stats["rows"] += record["rows"]
+            self.recent_queries.append(record)
+
+    # -- reruns -------------------------------------------------------------
+
+    def start_rerun(self, page):
+        """Begin timing a Streamlit rerun of `page`; queries until end_rerun belong to it."""
+        self._local.page = page
+        self._local.pending = []
+        self._local.started = time.perf_counter()
+
+    def end_rerun(self):
+        started = getattr(self._local, "started", None)
+        if started is None:
+            return None
+        elapsed = (time.perf_counter() - started) * 1000
+        queries = self._local.pending
+        for record in queries:
+            self.finish(record)
+        rerun = {
+            "type": "rerun",
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "page": self._local.page,
+            "ms": elapsed,
+            "queries": len(queries),
+            "query_ms": sum(q["ms"] for q in queries),
+            "slow_queries": sum(q["ms"] >= self.slow_ms for q in queries),
+        }
+        with self._lock:
+            pages = self._pages.setdefault(rerun["page"], [])
+            pages.append(elapsed)
+            del pages[:-KEEP_RECENT]
+            self.recent_reruns.append(rerun)
+        if self._log is not None:
+            for record in queries:
+                self._log.info(json.dumps({k: v for k, v in record.items() if k != "done"}))
+            self._log.info(json.dumps(rerun))
+        self._local.started = None
+        self._local.page = None
+        self._local.pending = None
+        return rerun
+
+    # -- reporting ----------------------------------------------------------
+
+    def query_stats(self):
+        """Per-statement totals, slowest total time first."""
+        with self._lock:
+            rows = [{"sql": sql, **stats, "avg_ms": stats["ms"] / stats["calls"]}
+                    for sql, stats in self._queries.items()]
+        return sorted(rows, key=lambda r: r["ms"], reverse=True)
+
+    def page_stats(self):
+        """Rerun time per page over the recent reruns."""
+        with self._lock:
+            pages = {page: sorted(times) for page, times in self._pages.items()}
+        return [{
+            "page": page,
+            "reruns": len(times),
+            "avg_ms": sum(times) / len(times),
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "max_ms": times[-1],
+        } for page, times in pages.items()]
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._pages.clear()
+            self.recent_queries.clear()
+            self.recent_reruns.clear()
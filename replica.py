@@ -0,0 +1,151 @@
+"""In-memory hot replica of food_data.db for read traffic.
+
+The whole database file (tables, indexes, FTS and summary tables) is copied
+into a shared-cache in-memory SQLite database with the backup API, and
+reader connections are opened on that copy instead of the file. A monitor
+connection watches `PRAGMA data_version`, which changes whenever any other
+connection commits to the file. When it moves, readers go back to disk and
+a background thread copies a fresh generation; readers switch over once it
+is loaded. Reads are therefore never staler than the disk, only slower while
+a copy is in flight.
+
+The old generation stays alive until the new one has been swapped in, so a
+refresh needs about twice the file size. The replica is skipped, and every
+read goes to disk, when twice the database is more than `memory_budget`
+bytes.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+
+MEMORY_BUDGET = 256 * 1024 * 1024
+
+_names = itertools.count(1)
+
+
+def database_bytes(conn):
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+class _Generation:
+    """One loaded copy: a named shared in-memory database kept open by `keeper`.
+
+    `data_version` is the monitor's value read before the copy started, so
+    the copy is at least that current.
+    """
+
+    def __init__(self, source, data_version):
+        self.uri = f"file:food_data_replica_{next(_names)}?mode=memory&cache=shared"
+        self.keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        source.backup(self.keeper)
+        self.data_version = data_version
+        self.size = database_bytes(self.keeper)
+
+
+class HotReplica:
+    """Per-thread reader connections on an in-memory copy of the database.
+
+    `connect` opens a read-only connection to the file. One is kept as the
+    monitor that watches for changes; every copy is taken on a connection of
+    its own, so checking the monitor never waits for a copy in flight.
+
+    `reader()` returns None whenever the caller should read from disk
+    instead: before the first copy is loaded, while the file has changes the
+    copy does not have yet, or once the budget has been exceeded.
+    """
+
+    def __init__(self, connect, memory_budget=MEMORY_BUDGET, factory=sqlite3.Connection):
+        self.memory_budget = memory_budget
+        self.factory = factory
+        self.refreshes = 0
+        self.disk_reads = 0
+        self.disabled = None  # reason the replica was given up on
+        self.last_refresh_seconds = None
+        self._connect = connect
+        self._monitor = connect()
+        self._monitor_lock = threading.Lock()
+        self._generation = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.refresh()
+
+    def _data_version(self):
+        with self._monitor_lock:
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self):
+        """Copy the current file into a new generation and switch readers to it."""
+        start = time.perf_counter()
+        version = self._data_version()
+        source = self._connect()
+        try:
+            size = database_bytes(source)
+            if 2 * size > self.memory_budget:  # old and new generation side by side
+                generation = None
+            else:
+                generation = _Generation(source, version)
+        finally:
+            source.close()
+        with self._lock:
+            self._refreshing = False
+            if generation is None:
+                self.disabled = (f"database is {size / 2**20:.1f} MiB; a refresh needs twice that, "
+                                 f"over the {self.memory_budget / 2**20:.1f} MiB budget")
+                old, self._generation = self._generation, None
+            else:
+                old, self._generation = self._generation, generation
+                self.refreshes += 1
+                self.last_refresh_seconds = time.perf_counter() - start
+        if old is not None:
+            old.keeper.close()  # memory is freed once the last reader on it reconnects
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing or self.disabled:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_safely, name="replica-refresh", daemon=True).start()
+
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+        except sqlite3.Error as e:
+            with self._lock:
+                self._refreshing = False
+                self.disabled = f"refresh failed: {e}"
+                self._generation = None
+
+    def reader(self):
+        """Read-only connection on the current copy for the calling thread, or None."""
+        version = self._data_version()
+        generation = self._generation  # after the check: a refresh may have just swapped it
+        if generation is None or version != generation.data_version:
+            if generation is not None:
+                self._refresh_in_background()
+            self.disk_reads += 1
+            return None
+        local = self._local
+        if getattr(local, "generation", None) is not generation:
+            if getattr(local, "conn", None) is not None:
+                local.conn.close()
+            local.conn = sqlite3.connect(generation.uri, uri=True, check_same_thread=False,
+                                         factory=self.factory)
+            local.conn.execute("PRAGMA query_only = ON")
+            local.generation = generation
+        return local.conn
+
+    def stats(self):
+        generation = self._generation
+        return {
+            "loaded": generation is not None,
+            "bytes": generation.size if generation else 0,
+            "memory_budget": self.memory_budget,
+            "refreshes": self.refreshes,
+            "last_refresh_seconds": self.last_refresh_seconds,
+            "disk_reads": self.disk_reads,
+            "disabled": self.disabled,
+        }
@@ -0,0 +1,261 @@
+"""The canned SQL reports and a cache for their results.
+
+Report results are cached per report and invalidated through the
+`table_versions` counters: a write to `claims` only re-runs the reports that
+read `claims`, and a repeated view is a dictionary lookup.
+
+A rebuilt report is computed from the latest columnar snapshot (see
+snapshots.py) when it has a vectorized twin there and the snapshot was taken
+at the versions the report's tables are at now; otherwise it runs the SQL.
+"""
+import re
+from datetime import date
+
+import pandas as pd
+
+import snapshots
+import versions
+from summaries import SUMMARY_SOURCES
+
+SQL_QUERIES = {
+    "1. How many food providers and recivers are there in each city?": """
+        SELECT City, COUNT(*) AS Total,'Providers' AS Type
+        FROM providers
+        GROUP BY City
+
+        UNION ALL
+
+        SELECT City, COUNT(*) AS Total,'Receivers' AS Type
+        FROM receivers
+        GROUP BY City;
+    """,
+
+    "2.Which type of food provider (restaurant, grocery store etc) contributes the most food?": """
+        SELECT Provider_Type, Total_Quantity
+        FROM summary_provider_type
+        ORDER BY Total_Quantity DESC;
+    """,
+
+    "3.What is the contact information of food providers in specific city?": """
+        SELECT Name, Contact
+        FROM providers
+        WHERE City = 'East Sheena';
+    """,
+
+    "4.Which receivers have claimed the most food?": """
+        SELECT r.Name, COUNT(c.Claim_ID) AS Total_Claims
+        FROM claims c
+        JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
+        GROUP BY r.Name
+        ORDER BY Total_Claims DESC;
+    """,
+
+    "5.What is the total quantity of food available from all providers?": """
+        SELECT SUM(Total_Quantity) AS Total_Food_Quantity
+        FROM summary_provider_type
+    """,
+
+    "6.Which city has the highest number of food listings?": """
+        SELECT Location AS City, Listings AS Total_Listings
+        FROM summary_city
+        ORDER BY Total_Listings DESC;
+    """,
+
+    "7.What are most commonly available food types?": """
+        SELECT Food_Type, Listings AS Count
+        FROM summary_food_type
+        ORDER BY Count DESC;
+    """,
+
+    "8.How many food claims have been made for each food item?": """
+        SELECT f.Food_Name, COUNT(c.Claim_ID) AS Total_Claims
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        ORDER BY Total_Claims DESC;
+    """,
+
+    "9.Which provider has had the highest number of successful food claims?": """
+        SELECT p.Name, COUNT(c.Claim_ID) AS Successful_Claims
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        JOIN providers p ON f.Provider_ID = p.Provider_ID
+        WHERE c.Status = 'Completed'
+        GROUP BY p.Name
+        ORDER BY Successful_Claims DESC;
+    """,
+
+    "10.What percentage of food claims are completed vs. pending vs. canceled?": """
+        SELECT Status, Claims * 100.0 / (SELECT SUM(Claims) FROM summary_claim_status) AS Percentage
+        FROM summary_claim_status
+        ORDER BY Status;
+    """,
+
+    "11.What is the average quantity of food claimed per receiver?": """
+        SELECT r.Name, AVG(f.Quantity) AS Avg_Claimed_Quantity
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
+        GROUP BY r.Name;
+    """,
+
+    "12.Which meal type (breakfast, lunch, dinner, snacks) is claimed the most?": """
+        SELECT f.Meal_Type, COUNT(*) AS Claim_Count
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        GROUP BY f.Meal_Type
+        ORDER BY Claim_Count DESC;
+    """,
+
+    "13.What is the total quantity of food donated by each provider?": """
+        SELECT p.Name, SUM(s.Total_Quantity) AS Total_Donated
+        FROM summary_provider s
+        JOIN providers p ON s.Provider_ID = p.Provider_ID
+        GROUP BY p.Name
+        ORDER BY Total_Donated DESC, p.Name;
+    """,
+
+    "14.How many expired food items are still listed?": """
+        SELECT COUNT(*) AS Expired_Items
+        FROM food_listings
+        WHERE Expiry_Date < Date('now');
+    """,
+
+    "15.What are the toP 5 cities with the highest completed claims?": """
+        SELECT f.Location AS City, COUNT(*) AS Completed_Claims
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        WHERE c.Status ='Completed'
+        GROUP BY f.Location
+        ORDER BY Completed_Claims DESC
+        LIMIT 5;
+    """,
+
+    "16.What are the top 5 most donated food items?": """
+        SELECT Food_Name, SUM(Quantity) AS Total_Donated
+        FROM food_listings
+        GROUP BY Food_Name
+        ORDER BY Total_Donated DESC
+        LIMIT 5;
+    """,
+
+    "17.How many inactive providers?": """
+        SELECT p.Name, p.City
+        FROM providers p
+        LEFT JOIN food_listings f ON p.Provider_ID = f.Provider_ID
+        WHERE f.Food_ID IS NULL;
+    """,
+
+    "18.Claims trend over time": """
+        SELECT DATE(Timestamp) AS Claim_Date, COUNT(*) AS Total_Claim
+        FROM claims
+        GROUP BY DATE(Timestamp)
+        ORDER BY Claim_Date ASC;
+    """,
+
+    "19.Claims trend by city": """
+        SELECT f.Location AS City, COUNT(*) AS Total_Claims
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        GROUP BY f.Location
+        ORDER BY Total_Claims DESC, City;
+    """,
+
+    "20.Claims made after food expiry": """
+        SELECT c.Claim_ID, f.Food_Name, f.Expiry_Date, c.Timestamp
+        FROM claims c
+        JOIN food_listings f ON c.Food_ID = f.Food_ID
+        WHERE DATE(c.Timestamp) > f.Expiry_Date;
+    """,
+
+    "21.Providers without any food listings": """
+        SELECT p.Provider_ID, p.Name, p.City
+        FROM providers p
+        LEFT JOIN food_listings f ON p.Provider_ID = f.Provider_ID
+        WHERE f.Food_ID IS NULL;
+    """,
+
+    "22.Meal type vs. quantity donated": """
+        SELECT Meal_Type, Total_Quantity
+        FROM summary_meal_type
+        ORDER BY Total_Quantity DESC;
+    """,
+
+    "23.Distribution of food types donated": """
+        SELECT Food_Type, Listings AS Total_Listings
+        FROM summary_food_type
+        ORDER BY Total_Listings DESC;
+    """,
+
+    "24.top 10 food donating providers": """
+        SELECT p.Name, SUM(s.Total_Quantity) AS Total_Quantity
+        FROM summary_provider s
+        JOIN providers p ON s.Provider_ID = p.Provider_ID
+        GROUP BY p.Name
+        ORDER BY Total_Quantity DESC, p.Name
+        LIMIT 10;
+    """,
+}
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)", re.IGNORECASE)
+
+
+def tables_read(sql):
+    """Data tables referenced by `sql`, used as the report's cache dependencies.
+
+    Summary tables count as the fact table they are maintained from.
+    """
+    tables = {t.lower() for t in _TABLE_REF.findall(sql)}
+    tables |= {SUMMARY_SOURCES[t] for t in tables if t in SUMMARY_SOURCES}
+    return tuple(sorted(tables & set(versions.DATA_TABLES)))
+
+
+REPORT_TABLES = {title: tables_read(sql) for title, sql in SQL_QUERIES.items()}
+
+# "20" -> "20. ...": the number each report title starts with
+REPORT_IDS = {title.split(".")[0]: title for title in SQL_QUERIES}
+
+# Reports relative to DATE('now') also go stale at midnight
+DATED_REPORTS = {title for title, sql in SQL_QUERIES.items() if "'now'" in sql.lower()}
+
+
+# Report id -> the same rows computed from a snapshot
+SNAPSHOT_REPORTS = {
+    "11": snapshots.avg_quantity_per_receiver,
+    "13": lambda snap: snapshots.top_providers(snap, limit=None).rename(
+        columns={"Total_Quantity": "Total_Donated"}),
+    "18": snapshots.claims_trend,
+    "19": snapshots.claims_by_city,
+    "24": lambda snap: snapshots.top_providers(snap, limit=10),
+}
+
+
+def _latest_snapshot(root):
+    try:
+        return snapshots.Snapshot.latest(root)
+    except FileNotFoundError:
+        return None
+
+
+class ReportCache(versions.VersionedCache):
+    """LRU of report DataFrames keyed on the versions of the tables they read."""
+
+    def __init__(self, max_entries=64, snapshot_root=snapshots.SNAPSHOT_DIR):
+        super().__init__(max_entries)
+        self.snapshot_root = snapshot_root
+        self.snapshot_builds = 0
+
+    def get(self, conn, title):
+        extra = (date.today().isoformat(),) if title in DATED_REPORTS else ()
+        return super().get(conn, title, REPORT_TABLES[title], lambda c: self.build(c, title), extra)
+
+    def build(self, conn, title):
+        """Run `title`, from the latest snapshot if it is current for the report's tables."""
+        report = SNAPSHOT_REPORTS.get(title.split(".")[0])
+        snap = _latest_snapshot(self.snapshot_root) if report and self.snapshot_root else None
+        if snap is not None:
+            tables = REPORT_TABLES[title]
+            taken = snap.manifest.get("table_versions", {})
+            if {t: taken.get(t) for t in tables} == versions.current(conn, tables):
+                self.snapshot_builds += 1
+                return report(snap)
+        return pd.read_sql_query(SQL_QUERIES[title], conn)
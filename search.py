@@ -0,0 +1,145 @@
+"""Full-text search over provider, receiver and food listing names.
+
+Each searchable table has an external-content FTS5 index kept in sync by
+triggers, so searches are index lookups ranked with bm25 instead of a
+LIKE/str.contains scan. Every search word matches as a prefix, and a word
+that matches nothing is expanded to indexed words within a small edit
+distance, which catches most typos.
+"""
+import re
+
+import pandas as pd
+
+from filters import PAGE_SIZE
+
+# table -> (primary key, indexed columns, bm25 column weights)
+SEARCH_INDEXES = {
+    "providers": ("Provider_ID", ("Name", "Address", "City"), (10.0, 1.0, 2.0)),
+    "receivers": ("Receiver_ID", ("Name", "City"), (10.0, 2.0)),
+    "food_listings": ("Food_ID", ("Food_Name", "Location"), (10.0, 2.0)),
+}
+
+MAX_EXPANSIONS = 5
+
+
+def fts_table(table):
+    return f"{table}_fts"
+
+
+def index_ddl(table):
+    pk, columns, _ = SEARCH_INDEXES[table]
+    fts = fts_table(table)
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols}, content='{table}', content_rowid='{pk}',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts}_vocab USING fts5vocab({fts}, 'row')",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {pk}, {cols} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new});
+            END""",
+    ]
+
+
+def install(conn):
+    """Create the FTS indexes and triggers and index the existing rows."""
+    for table in SEARCH_INDEXES:
+        for ddl in index_ddl(table):
+            conn.execute(ddl)
+        conn.execute(f"INSERT INTO {fts_table(table)} ({fts_table(table)}) VALUES ('rebuild')")
+
+
+def tokens(text):
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i]
+        for j, cb in enumerate(b, 1):
+            row.append(min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(row) > limit:
+            return limit + 1
+        previous = row
+    return previous[-1]
+
+
+def _has_prefix(conn, vocab, token):
+    return conn.execute(
+        f"SELECT 1 FROM {vocab} WHERE term >= ? AND term < ? LIMIT 1", (token, token + "\U0010ffff")
+    ).fetchone() is not None
+
+
+def similar_terms(conn, table, token):
+    """Indexed words close to `token`; candidates share its first letter."""
+    limit = 1 if len(token) <= 5 else 2
+    vocab = fts_table(table) + "_vocab"
+    rows = conn.execute(
+        f"SELECT term, doc FROM {vocab} WHERE term >= ? AND term < ?",
+        (token[0], token[0] + "\U0010ffff"),
+    ).fetchall()
+    scored = []
+    for term, docs in rows:
+        distance = edit_distance(token, term, limit)
+        if distance <= limit:
+            scored.append((distance, -docs, term))
+    return [term for _, _, term in sorted(scored)[:MAX_EXPANSIONS]]
+
+
+def match_expression(conn, table, text, fuzzy=True):
+    """FTS5 MATCH expression for the search box text, or None if it has no words."""
+    words = tokens(text)
+    if not words:
+        return None
+    vocab = fts_table(table) + "_vocab"
+    parts = []
+    for word in words:
+        options = [f'"{word}"*']
+        if fuzzy and len(word) >= 3 and not _has_prefix(conn, vocab, word):
+            options += [f'"{term}"' for term in similar_terms(conn, table, word)]
+        parts.append(options[0] if len(options) == 1 else "(" + " OR ".join(options) + ")")
+    return " AND ".join(parts)
+
+
+def _matches(table):
+    pk, _, weights = SEARCH_INDEXES[table]
+    fts = fts_table(table)
+    weights = ", ".join(str(w) for w in weights)
+    return (f"{table} t JOIN (SELECT rowid, bm25({fts}, {weights}) AS score "
+            f"FROM {fts} WHERE {fts} MATCH ?) m ON t.{pk} = m.rowid")
+
+
+def count_matches(conn, table, expression, where="", params=()):
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {_matches(table)}{where}", [expression, *params]
+    ).fetchone()[0]
+
+
+def matches_query(table, expression, where="", params=()):
+    """(sql, params) selecting every `table` row matching `expression`, best match first.
+
+    `where`/`params` come from filters.build_where and narrow the matches
+    further; their unqualified columns resolve to the base table.
+    """
+    pk = SEARCH_INDEXES[table][0]
+    return f"SELECT t.* FROM {_matches(table)}{where} ORDER BY m.score, t.{pk}", [expression, *params]
+
+
+def fetch_matches(conn, table, expression, where="", params=(), page=1, page_size=PAGE_SIZE):
+    """One page of `table` rows matching `expression`, best match first."""
+    offset = (max(page, 1) - 1) * page_size
+    sql, params = matches_query(table, expression, where, params)
+    return pd.read_sql_query(sql + " LIMIT ? OFFSET ?", conn, params=[*params, page_size, offset])
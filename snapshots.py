@@ -0,0 +1,278 @@
+"""Columnar snapshots of food_data.db and vectorized reports over them.
+
+    python snapshots.py export --db food_data.db --out snapshots
+    python snapshots.py report claims_by_city --out snapshots
+
+`export` copies the four tables, inside one read transaction, into a
+directory of NumPy arrays, one .npy file per column. Text columns are
+dictionary-encoded: int32 codes plus a JSON list of the distinct values, with
+-1 for NULL. Dates become int32 days since 1970-01-01. Snapshots are written
+to a temporary directory and published by rewriting the LATEST pointer, so a
+reader never sees a partial one.
+
+The heavy reports (claims by city, average quantity per receiver, provider
+leaderboards, claims trend) are then computed with searchsorted joins and
+bincount group-bys over memory-mapped arrays, away from the SQLite file the
+CRUD page writes to. The manifest records the table versions the snapshot was
+taken at, and reports.ReportCache builds those reports from the latest
+snapshot, for the SQL reports page and the API alike, while the versions of
+the tables a report reads still match; after a write it falls back to SQL
+until the next export.
+
+The columns are .npy rather than Parquet even though pyarrow is installed:
+np.load can memory-map them directly, with no decode step per request.
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import versions
+
+SNAPSHOT_DIR = "snapshots"
+KEEP = 3
+CHUNK_SIZE = 100_000
+
+INT_NULL = np.iinfo(np.int64).min
+DAY_NULL = np.iinfo(np.int32).min
+EPOCH = np.datetime64("1970-01-01", "D")
+
+# column -> encoding; rows are exported in primary key order
+SNAPSHOT_COLUMNS = {
+    "providers": {"Provider_ID": "int", "Name": "dict", "Type": "dict", "City": "dict"},
+    "receivers": {"Receiver_ID": "int", "Name": "dict", "Type": "dict", "City": "dict"},
+    "food_listings": {"Food_ID": "int", "Food_Name": "dict", "Quantity": "int", "Expiry_Date": "day",
+                      "Provider_ID": "int", "Provider_Type": "dict", "Location": "dict",
+                      "Food_Type": "dict", "Meal_Type": "dict"},
+    "claims": {"Claim_ID": "int", "Food_ID": "int", "Receiver_ID": "int", "Status": "dict",
+               "Timestamp": "day"},
+}
+
+DTYPES = {"int": np.int64, "dict": np.int32, "day": np.int32}
+
+
+def _encode_dict(values, dictionary):
+    """Map a chunk of values to global codes, growing `dictionary` (value -> code)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapping = np.array([dictionary.setdefault(u, len(dictionary)) for u in uniques], dtype=np.int32)
+    return np.where(codes < 0, -1, mapping[codes] if len(mapping) else -1)
+
+
+def _encode_day(values):
+    days = pd.to_datetime(values.astype("string").str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    out = (days.values.astype("datetime64[D]") - EPOCH).astype(np.int64)
+    return np.where(days.isna().values, DAY_NULL, out)
+
+
+def _export_table(conn, table, directory, chunk_size):
+    spec = SNAPSHOT_COLUMNS[table]
+    pk = next(iter(spec))
+    rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    arrays = {col: np.empty(rows, dtype=DTYPES[kind]) for col, kind in spec.items()}
+    dictionaries = {col: {} for col, kind in spec.items() if kind == "dict"}
+    pos = 0
+    sql = f"SELECT {', '.join(spec)} FROM {table} ORDER BY {pk}"
+    for chunk in pd.read_sql_query(sql, conn, chunksize=chunk_size):
+        part = slice(pos, pos + len(chunk))
+        for col, kind in spec.items():
+            values = chunk[col]
+            if kind == "int":
+                arrays[col][part] = pd.to_numeric(values, errors="coerce").fillna(INT_NULL).astype(np.int64)
+            elif kind == "dict":
+                arrays[col][part] = _encode_dict(values, dictionaries[col])
+            else:
+                arrays[col][part] = _encode_day(values)
+        pos += len(chunk)
+    for col, array in arrays.items():
+        np.save(os.path.join(directory, f"{table}.{col}.npy"), array)
+    for col, dictionary in dictionaries.items():
+        with open(os.path.join(directory, f"{table}.{col}.json"), "w", encoding="utf-8") as f:
+            json.dump(list(dictionary), f, ensure_ascii=False)
+    return rows
+
+
+def export(conn, root=SNAPSHOT_DIR, chunk_size=CHUNK_SIZE, keep=KEEP):
+    """Write a consistent snapshot of the data tables under `root`; returns its path."""
+    os.makedirs(root, exist_ok=True)
+    name = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    staging = os.path.join(root, f".tmp-{name}")
+    os.makedirs(staging)
+    manifest = {"created_at": datetime.now().isoformat(timespec="seconds"), "rows": {}}
+    conn.execute("BEGIN")  # one read transaction: all tables from the same moment
+    try:
+        manifest["table_versions"] = versions.current(conn)
+        for table in SNAPSHOT_COLUMNS:
+            manifest["rows"][table] = _export_table(conn, table, staging, chunk_size)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        conn.rollback()
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    final = os.path.join(root, name)
+    os.rename(staging, final)
+    pointer = os.path.join(root, "LATEST")
+    with open(pointer + ".tmp", "w") as f:
+        f.write(name)
+    os.replace(pointer + ".tmp", pointer)
+
+    published = sorted(d for d in os.listdir(root) if not d.startswith(".") and d != "LATEST"
+                       and not d.endswith(".tmp"))
+    for old in published[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return final
+
+
+class Snapshot:
+    """Read access to a published snapshot; arrays are memory-mapped on first use."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        self._arrays = {}
+        self._dictionaries = {}
+
+    @classmethod
+    def latest(cls, root=SNAPSHOT_DIR):
+        with open(os.path.join(root, "LATEST")) as f:
+            return cls(os.path.join(root, f.read().strip()))
+
+    def column(self, table, col):
+        key = (table, col)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(os.path.join(self.path, f"{table}.{col}.npy"), mmap_mode="r")
+        return self._arrays[key]
+
+    def dictionary(self, table, col):
+        key = (table, col)
+        if key not in self._dictionaries:
+            with open(os.path.join(self.path, f"{table}.{col}.json"), encoding="utf-8") as f:
+                self._dictionaries[key] = np.array(json.load(f) + [None], dtype=object)
+        return self._dictionaries[key]  # code -1 indexes the trailing None
+
+
+def _lookup(keys, sorted_ids):
+    """Row positions of `keys` in the sorted primary key array, and which keys were found."""
+    if len(sorted_ids) == 0:
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    pos = np.searchsorted(sorted_ids, keys)
+    pos = np.minimum(pos, len(sorted_ids) - 1)
+    return pos, sorted_ids[pos] == keys
+
+
+def _group(codes, labels, weights=None):
+    """bincount over dictionary codes (-1 = NULL) -> (labels, totals, counts) of non-empty groups.
+
+    Groups come out NULL first and then in label order, as SQLite's GROUP BY
+    returns them, so reports sorted on top of this break ties the same way.
+    """
+    shifted = np.asarray(codes, dtype=np.int64) + 1  # NULL becomes bin 0
+    size = len(labels)  # labels already carries the NULL label last
+    counts = np.bincount(shifted, minlength=size)
+    totals = np.bincount(shifted, weights=weights, minlength=size) if weights is not None else counts
+    bins = np.r_[0, 1 + np.argsort(labels[:-1], kind="stable")].astype(np.int64)
+    bins = bins[counts[bins] > 0]
+    return labels[bins - 1], totals[bins], counts[bins]  # bin 0 (NULL) -> labels[-1]
+
+
+def claims_by_city(snap):
+    """Report 19: claims per listing Location."""
+    food_ids = snap.column("food_listings", "Food_ID")
+    pos, found = _lookup(snap.column("claims", "Food_ID"), food_ids)
+    location = snap.column("food_listings", "Location")[pos[found]]
+    cities, totals, _ = _group(location, snap.dictionary("food_listings", "Location"))
+    df = pd.DataFrame({"City": cities, "Total_Claims": totals.astype(np.int64)})
+    return df.sort_values("Total_Claims", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def avg_quantity_per_receiver(snap):
+    """Report 11: average claimed listing quantity per receiver name."""
+    food_pos, food_found = _lookup(snap.column("claims", "Food_ID"), snap.column("food_listings", "Food_ID"))
+    rec_pos, rec_found = _lookup(snap.column("claims", "Receiver_ID"), snap.column("receivers", "Receiver_ID"))
+    both = food_found & rec_found
+    quantity = snap.column("food_listings", "Quantity")[food_pos[both]]
+    names = snap.column("receivers", "Name")[rec_pos[both]]
+    valid = quantity != INT_NULL
+    labels = snap.dictionary("receivers", "Name")
+    groups, sums, _ = _group(names, labels, np.where(valid, quantity, 0).astype(np.float64))
+    _, quantities, _ = _group(names, labels, valid.astype(np.float64))
+    with np.errstate(invalid="ignore"):  # AVG over only NULL quantities is NULL
+        average = np.where(quantities > 0, sums / quantities, np.nan)
+    return pd.DataFrame({"Name": groups, "Avg_Claimed_Quantity": average})
+
+
+def top_providers(snap, limit=10):
+    """Reports 13/24: total listed quantity per provider name."""
+    quantity = snap.column("food_listings", "Quantity")
+    pos, found = _lookup(snap.column("food_listings", "Provider_ID"), snap.column("providers", "Provider_ID"))
+    names = snap.column("providers", "Name")[pos[found]]
+    weights = np.where(quantity[found] != INT_NULL, quantity[found], 0).astype(np.float64)
+    labels, totals, _ = _group(names, snap.dictionary("providers", "Name"), weights)
+    df = pd.DataFrame({"Name": labels, "Total_Quantity": totals.astype(np.int64)})
+    df = df.sort_values("Total_Quantity", ascending=False, kind="stable").reset_index(drop=True)
+    return df.head(limit) if limit else df
+
+
+def claims_trend(snap):
+    """Report 18: claims per day; claims without a date form a leading NULL row."""
+    days = np.asarray(snap.column("claims", "Timestamp"))
+    undated = np.count_nonzero(days == DAY_NULL)
+    days = days[days != DAY_NULL]
+    dates, totals = [], []
+    if len(days):
+        first = days.min()
+        counts = np.bincount(days - first)
+        present = np.nonzero(counts)[0]
+        dates = list((EPOCH + (present + first).astype("timedelta64[D]")).astype(str))
+        totals = list(counts[present])
+    if undated:
+        dates, totals = [None] + dates, [undated] + totals
+    return pd.DataFrame({"Claim_Date": dates, "Total_Claim": np.array(totals, dtype=np.int64)})
+
+
+REPORTS = {
+    "claims_by_city": claims_by_city,
+    "avg_quantity_per_receiver": avg_quantity_per_receiver,
+    "top_providers": top_providers,
+    "claims_trend": claims_trend,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar snapshots and vectorized reports")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="write a new snapshot")
+    exp.add_argument("--db", default="food_data.db")
+    exp.add_argument("--out", default=SNAPSHOT_DIR)
+    exp.add_argument("--keep", type=int, default=KEEP)
+    rep = sub.add_parser("report", help="run a report on the latest snapshot")
+    rep.add_argument("name", choices=sorted(REPORTS))
+    rep.add_argument("--out", default=SNAPSHOT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        conn = sqlite3.connect(args.db, timeout=30)
+        try:
+            start = time.perf_counter()
+            path = export(conn, args.out, keep=args.keep)
+        finally:
+            conn.close()
+        print(f"snapshot {path} written in {time.perf_counter() - start:.2f}s")
+    else:
+        start = time.perf_counter()
+        df = REPORTS[args.name](Snapshot.latest(args.out))
+        print(df.to_string(index=False))
+        print(f"{len(df)} rows in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
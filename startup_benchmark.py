@@ -0,0 +1,92 @@
+"""Cold and warm rerun times of the Streamlit app, per page.
+
+    python startup_benchmark.py --app seema.py --repeat 5 --out startup.json
+
+Every page is measured in a fresh Python process through Streamlit's
+AppTest harness, with no server or browser involved:
+
+- `first_run_ms` is the first script run, which lands on the default page
+  (Home). It includes every import the script does at the top level, so it
+  is what the first visitor after a restart waits for.
+- `page_cold_ms` is the next run, which switches to the page. It includes
+  whatever that page imports and initializes lazily.
+- `warm_ms` is the median of `--repeat` further reruns of the page.
+- `heavy_modules` lists which of pandas, numpy, plotly and matplotlib were
+  loaded by the end.
+
+Point --app at another checkout's seema.py to compare two versions. The app
+runs in its own directory against the food_data.db found there.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "matplotlib")
+
+_PROBE = r"""
+import json, os, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+
+app, page, repeat = sys.argv[1], sys.argv[2], int(sys.argv[3])
+os.chdir(os.path.dirname(app))
+sys.path.insert(0, os.getcwd())
+at = AppTest.from_file(app, default_timeout=300)
+
+start = time.perf_counter()
+at.run()
+first = (time.perf_counter() - start) * 1000
+nav = at.sidebar.radio[0]
+result = {"first_run_ms": first, "pages": list(nav.options)}
+if page:
+    start = time.perf_counter()
+    nav.set_value(page).run()
+    result["page_cold_ms"] = (time.perf_counter() - start) * 1000
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    result["warm_ms"] = statistics.median(warm)
+result["heavy_modules"] = [m for m in %r if m in sys.modules]
+print(json.dumps(result))
+""" % (HEAVY_MODULES,)
+
+
+def probe(app, page="", repeat=5):
+    """Run one measurement in a fresh interpreter; returns its result dict."""
+    done = subprocess.run([sys.executable, "-c", _PROBE, app, page, str(repeat)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def run(app, repeat=5):
+    app = os.path.abspath(app)
+    landing = probe(app)
+    results = {"app": app, "first_run_ms": landing["first_run_ms"], "pages": {}}
+    for page in landing["pages"]:
+        measured = probe(app, page, repeat)
+        results["pages"][page] = {k: measured[k] for k in ("page_cold_ms", "warm_ms", "heavy_modules")}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold and warm Streamlit reruns per page")
+    parser.add_argument("--app", default="seema.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = run(args.app, args.repeat)
+    print(f"first run (Home): {results['first_run_ms']:8.1f} ms")
+    print(f"{'page':<28} {'cold ms':>9} {'warm ms':>9}  heavy modules")
+    for page, r in results["pages"].items():
+        print(f"{page:<28} {r['page_cold_ms']:9.1f} {r['warm_ms']:9.1f}  {', '.join(r['heavy_modules'])}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Materialized aggregates for the dashboard KPIs.
+
+One small table per grouping (provider, provider type, city, meal type, food
+type, claim status) holds the row count and total quantity of each group.
+Triggers on `food_listings` and `claims` adjust the affected groups on every
+INSERT, UPDATE and DELETE, so the reports read O(groups) rows instead of
+scanning the fact tables.
+
+    python summaries.py --db food_data.db            # consistency check
+    python summaries.py --db food_data.db --rebuild  # recompute from scratch
+"""
+import argparse
+import sqlite3
+import sys
+
+import versions
+
+# summary table -> grouping column of food_listings
+LISTING_SUMMARIES = {
+    "summary_provider": "Provider_ID",
+    "summary_provider_type": "Provider_Type",
+    "summary_city": "Location",
+    "summary_meal_type": "Meal_Type",
+    "summary_food_type": "Food_Type",
+}
+
+# summary table -> grouping column of claims
+CLAIM_SUMMARIES = {
+    "summary_claim_status": "Status",
+}
+
+SUMMARY_SOURCES = {
+    **{name: "food_listings" for name in LISTING_SUMMARIES},
+    **{name: "claims" for name in CLAIM_SUMMARIES},
+}
+
+LISTING_TRIGGER_COLUMNS = "Quantity, " + ", ".join(LISTING_SUMMARIES.values())
+
+
+def _listing_table(name, key):
+    key_type = "INTEGER" if key.endswith("_ID") else "TEXT"
+    return f"""CREATE TABLE IF NOT EXISTS {name} (
+                   {key} {key_type} PRIMARY KEY,
+                   Listings INTEGER NOT NULL,
+                   Total_Quantity INTEGER NOT NULL
+               )"""
+
+
+def _claim_table(name, key):
+    return f"""CREATE TABLE IF NOT EXISTS {name} (
+                   {key} TEXT PRIMARY KEY,
+                   Claims INTEGER NOT NULL
+               )"""
+
+
+# NULL is a group of its own in GROUP BY but never conflicts on a primary
+# key, so the trigger bodies seed the group row and then match it with IS
+# rather than relying on ON CONFLICT.
+def _add_listing(name, key, row):
+    return f"""
+        INSERT INTO {name} ({key}, Listings, Total_Quantity)
+            SELECT {row}.{key}, 0, 0
+            WHERE NOT EXISTS (SELECT 1 FROM {name} WHERE {key} IS {row}.{key});
+        UPDATE {name} SET Listings = Listings + 1,
+                          Total_Quantity = Total_Quantity + IFNULL({row}.Quantity, 0)
+            WHERE {key} IS {row}.{key};"""
+
+
+def _remove_listing(name, key, row):
+    return f"""
+        UPDATE {name} SET Listings = Listings - 1,
+                          Total_Quantity = Total_Quantity - IFNULL({row}.Quantity, 0)
+            WHERE {key} IS {row}.{key};
+        DELETE FROM {name} WHERE {key} IS {row}.{key} AND Listings = 0;"""
+
+
+def _add_claim(name, key, row):
+    return f"""
+        INSERT INTO {name} ({key}, Claims)
+            SELECT {row}.{key}, 0
+            WHERE NOT EXISTS (SELECT 1 FROM {name} WHERE {key} IS {row}.{key});
+        UPDATE {name} SET Claims = Claims + 1 WHERE {key} IS {row}.{key};"""
+
+
+def _remove_claim(name, key, row):
+    return f"""
+        UPDATE {name} SET Claims = Claims - 1 WHERE {key} IS {row}.{key};
+        DELETE FROM {name} WHERE {key} IS {row}.{key} AND Claims = 0;"""
+
+
+def _trigger(name, event, table, steps):
+    body = "".join(steps)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN{body}\nEND"
+
+
+def trigger_ddl():
+    listings = LISTING_SUMMARIES.items()
+    claims = CLAIM_SUMMARIES.items()
+    return [
+        _trigger("trg_food_listings_summary_insert", "INSERT", "food_listings",
+                 [_add_listing(n, k, "NEW") for n, k in listings]),
+        _trigger("trg_food_listings_summary_delete", "DELETE", "food_listings",
+                 [_remove_listing(n, k, "OLD") for n, k in listings]),
+        _trigger("trg_food_listings_summary_update", f"UPDATE OF {LISTING_TRIGGER_COLUMNS}", "food_listings",
+                 [_remove_listing(n, k, "OLD") for n, k in listings]
+                 + [_add_listing(n, k, "NEW") for n, k in listings]),
+        _trigger("trg_claims_summary_insert", "INSERT", "claims",
+                 [_add_claim(n, k, "NEW") for n, k in claims]),
+        _trigger("trg_claims_summary_delete", "DELETE", "claims",
+                 [_remove_claim(n, k, "OLD") for n, k in claims]),
+        _trigger("trg_claims_summary_update", "UPDATE OF Status", "claims",
+                 [_remove_claim(n, k, "OLD") for n, k in claims]
+                 + [_add_claim(n, k, "NEW") for n, k in claims]),
+    ]
+
+
+def _fresh_query(name):
+    """GROUP BY over the fact table, producing the same rows as `name` should hold."""
+    if name in LISTING_SUMMARIES:
+        key = LISTING_SUMMARIES[name]
+        return f"""SELECT {key}, COUNT(*), IFNULL(SUM(Quantity), 0)
+                   FROM food_listings GROUP BY {key}"""
+    key = CLAIM_SUMMARIES[name]
+    return f"SELECT {key}, COUNT(*) FROM claims GROUP BY {key}"
+
+
+def install(conn):
+    """Create the summary tables and triggers and fill them from the data."""
+    for name, key in LISTING_SUMMARIES.items():
+        conn.execute(_listing_table(name, key))
+    for name, key in CLAIM_SUMMARIES.items():
+        conn.execute(_claim_table(name, key))
+    for ddl in trigger_ddl():
+        conn.execute(ddl)
+    rebuild(conn)
+
+
+def rebuild(conn):
+    for name in SUMMARY_SOURCES:
+        conn.execute(f"DELETE FROM {name}")
+        conn.execute(f"INSERT INTO {name} {_fresh_query(name)}")
+
+
+def check(conn):
+    """Return {summary table: number of groups that disagree with the fact table}."""
+    mismatches = {}
+    for name in SUMMARY_SOURCES:
+        stored = f"SELECT * FROM {name}"
+        fresh = _fresh_query(name)
+        bad = conn.execute(
+            f"""SELECT COUNT(*) FROM (
+                    SELECT * FROM ({stored} EXCEPT {fresh})
+                    UNION ALL
+                    SELECT * FROM ({fresh} EXCEPT {stored}))"""
+        ).fetchone()[0]
+        if bad:
+            mismatches[name] = bad
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check or rebuild the KPI summary tables")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args(argv)
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        if args.rebuild:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild(conn)
+            # caches keyed on the old versions would keep serving the old summaries
+            versions.bump(conn, sorted(set(SUMMARY_SOURCES.values())))
+            conn.commit()
+            print("summaries rebuilt")
+        mismatches = check(conn)
+    finally:
+        conn.close()
+    for name, bad in mismatches.items():
+        print(f"{name}: {bad} inconsistent groups")
+    if mismatches:
+        print("run with --rebuild to recompute")
+        sys.exit(1)
+    print("summaries consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Archive expired food listings in small batches.
+
+    python sweeper.py --db food_data.db                 # one sweep
+    python sweeper.py --db food_data.db --every 3600    # sweep hourly
+
+Expired listings are found through the Expiry_Date index, oldest first, and
+moved to `food_listings_archive` a batch at a time. Each batch is its own
+short write transaction followed by a pause, so dashboard readers (WAL) and
+CRUD writers are never held up for long. Listings that have claims are kept,
+because the claim reports join claims to their listing.
+"""
+import argparse
+import sqlite3
+import time
+from datetime import date
+
+from dates import to_iso_date
+from migrations import TABLE_COLUMNS
+import versions
+
+BATCH_SIZE = 1000
+PAUSE_SECONDS = 0.05
+
+# keyset over (Expiry_Date, Food_ID), the order of idx_food_listings_expiry,
+# so claimed listings skipped by one batch are not rescanned by the next
+NEXT_BATCH = """
+    SELECT f.Food_ID, f.Expiry_Date
+    FROM food_listings f
+    WHERE f.Expiry_Date < ?
+      AND (f.Expiry_Date, f.Food_ID) > (?, ?)
+    ORDER BY f.Expiry_Date, f.Food_ID
+    LIMIT ?
+"""
+
+
+def _archive_batch(conn, food_ids):
+    columns = ", ".join(TABLE_COLUMNS["food_listings"])
+    ids = ", ".join("?" * len(food_ids))
+    unclaimed = f"""Food_ID IN ({ids})
+                    AND NOT EXISTS (SELECT 1 FROM claims c WHERE c.Food_ID = food_listings.Food_ID)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            f"""INSERT OR REPLACE INTO food_listings_archive ({columns}, Archived_At)
+                SELECT {columns}, datetime('now') FROM food_listings WHERE {unclaimed}""",
+            food_ids,
+        )
+        moved = conn.execute(f"DELETE FROM food_listings WHERE {unclaimed}", food_ids).rowcount
+        if moved:
+            versions.bump(conn, ["food_listings"])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return moved
+
+
+def sweep(conn, today=None, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    """Archive every unclaimed listing that expired before `today`.
+
+    Returns (archived, scanned, seconds).
+    """
+    today = to_iso_date(today or date.today())
+    last = ("", 0)
+    archived = scanned = 0
+    start = time.perf_counter()
+    while True:
+        rows = conn.execute(NEXT_BATCH, (today, *last, batch_size)).fetchall()
+        if not rows:
+            break
+        scanned += len(rows)
+        last = (rows[-1][1], rows[-1][0])
+        archived += _archive_batch(conn, [food_id for food_id, _ in rows])
+        if pause:
+            time.sleep(pause)
+    return archived, scanned, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive expired food listings")
+    parser.add_argument("--db", default="food_data.db")
+    parser.add_argument("--today", help="treat this date (YYYY-MM-DD) as today")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=PAUSE_SECONDS,
+                        help="seconds to yield between batches")
+    parser.add_argument("--every", type=float, help="keep running, sweeping every N seconds")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        while True:
+            archived, scanned, seconds = sweep(conn, args.today, args.batch_size, args.pause)
+            remaining = conn.execute("SELECT COUNT(*) FROM food_listings").fetchone()[0]
+            rate = archived / seconds if seconds else 0
+            print(f"archived {archived:,} of {scanned:,} expired listings in {seconds:.2f}s "
+                  f"({rate:,.0f} rows/s); {remaining:,} listings remain")
+            if not args.every:
+                break
+            time.sleep(args.every)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
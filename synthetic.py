@@ -0,0 +1,124 @@
+"""Seeded synthetic partner CSVs at any scale.
+
+    python synthetic.py --rows 1m --out data_1m --seed 42
+
+Writes providers, receivers, food_listings and claims CSVs with the same
+columns and value formats as the shipped ones, `--rows` rows each (like the
+shipped files, which hold 1000 of each). Every non-key column is drawn from
+its empirical distribution in the shipped CSVs, except the city columns,
+whose vocabulary grows with the row count so filters keep their selectivity.
+Foreign keys are drawn uniformly from the generated key ranges. The same
+seed and scale always produce the same files.
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from loader import CSV_FILES
+
+SEED = 42
+CHUNK_SIZE = 500_000
+CITIES_PER_ROW = 0.5  # the shipped files have roughly one distinct city per two rows
+
+# table -> {column: how to generate it}; "sample" draws from the shipped values
+COLUMNS = {
+    "providers": {"Provider_ID": "key", "Name": "sample", "Type": "sample", "Address": "sample",
+                  "City": "city", "Contact": "sample"},
+    "receivers": {"Receiver_ID": "key", "Name": "sample", "Type": "sample", "City": "city",
+                  "Contact": "sample"},
+    "food_listings": {"Food_ID": "key", "Food_Name": "sample", "Quantity": "sample",
+                      "Expiry_Date": "sample", "Provider_ID": "providers", "Provider_Type": "sample",
+                      "Location": "city", "Food_Type": "sample", "Meal_Type": "sample"},
+    "claims": {"Claim_ID": "key", "Food_ID": "food_listings", "Receiver_ID": "receivers",
+               "Status": "sample", "Timestamp": "sample"},
+}
+
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    """'10k' -> 10000, '1m' -> 1000000, '2500' -> 2500."""
+    text = text.strip().lower()
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def empirical(data_dir="."):
+    """{table: {column: (values, probabilities)}} from the shipped CSVs."""
+    distributions = {}
+    for table, file_name in CSV_FILES.items():
+        df = pd.read_csv(os.path.join(data_dir, file_name), dtype=str, keep_default_na=False)
+        distributions[table] = {}
+        for column in df.columns:
+            counts = df[column].value_counts()
+            distributions[table][column] = (counts.index.to_numpy(), (counts / counts.sum()).to_numpy())
+    return distributions
+
+
+def city_pool(distributions, rows, rng):
+    """Shipped city names, extended with numbered variants to ~CITIES_PER_ROW * rows."""
+    shipped = np.unique(np.concatenate([
+        distributions["providers"]["City"][0],
+        distributions["receivers"]["City"][0],
+        distributions["food_listings"]["Location"][0],
+    ]))
+    size = max(len(shipped), int(rows * CITIES_PER_ROW))
+    extra = size - len(shipped)
+    if extra <= 0:
+        return shipped
+    bases = shipped[rng.integers(0, len(shipped), extra)]
+    numbers = np.arange(1, extra + 1).astype(str)
+    return np.concatenate([shipped, np.char.add(np.char.add(bases.astype(str), " "), numbers)])
+
+
+def generate_chunk(table, start, size, rows, distributions, cities, rng):
+    columns = {}
+    for column, kind in COLUMNS[table].items():
+        if kind == "key":
+            columns[column] = np.arange(start + 1, start + size + 1)
+        elif kind == "sample":
+            values, weights = distributions[table][column]
+            columns[column] = values[rng.choice(len(values), size, p=weights)]
+        elif kind == "city":
+            columns[column] = cities[rng.integers(0, len(cities), size)]
+        else:  # foreign key into another generated table
+            columns[column] = rng.integers(1, rows + 1, size)
+    return pd.DataFrame(columns)
+
+
+def generate(out_dir, rows, seed=SEED, data_dir=".", chunk_size=CHUNK_SIZE):
+    """Write the four CSVs for `rows` rows per table into `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    distributions = empirical(data_dir)
+    rng = np.random.default_rng(seed)
+    cities = city_pool(distributions, rows, rng)
+    for table, file_name in CSV_FILES.items():
+        path = os.path.join(out_dir, file_name)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for start in range(0, rows, chunk_size):
+                chunk = generate_chunk(table, start, min(chunk_size, rows - start), rows,
+                                       distributions, cities, rng)
+                chunk.to_csv(f, index=False, header=start == 0, quoting=csv.QUOTE_MINIMAL)
+    return out_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic partner CSVs")
+    parser.add_argument("--rows", default="10k", help="rows per table, e.g. 10k, 1m, 10m")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--data-dir", default=".", help="directory with the shipped CSVs")
+    args = parser.parse_args(argv)
+    rows = parse_rows(args.rows)
+    start = time.perf_counter()
+    generate(args.out, rows, args.seed, args.data_dir)
+    print(f"{rows:,} rows per table written to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import io
+import json
+import sqlite3
+
+import pytest
+
+import batch
+from migrations import migrate
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "food.db")
+    migrate(conn)
+    conn.execute("INSERT INTO providers (Provider_ID, Name) VALUES (1, 'Provider')")
+    conn.executemany(
+        """INSERT INTO food_listings (Food_ID, Food_Name, Quantity, Expiry_Date, Provider_ID)
+           VALUES (?, ?, 5, '2025-03-20', 1)""",
+        [(1, "Bread"), (2, "Rice")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def jsonl(*records):
+    return io.BytesIO("".join(json.dumps(r) + "\n" for r in records).encode())
+
+
+def apply(conn, operation, stream):
+    return batch.apply_batch(lambda: batch.transaction(conn, "food_listings"), "food_listings",
+                             operation, stream, "jsonl")
+
+
+def test_fractional_key_is_rejected(conn):
+    applied, errors, _ = apply(conn, "update", jsonl({"Food_ID": 1.7, "Quantity": 9}))
+    assert applied == 0
+    assert errors == [(1, "Food_ID: 1.7 is not a whole number")]
+    assert conn.execute("SELECT Quantity FROM food_listings WHERE Food_ID = 1").fetchone()[0] == 5
+
+
+def test_whole_float_is_accepted(conn):
+    applied, errors, _ = apply(conn, "update", jsonl({"Food_ID": 2.0, "Quantity": 7}))
+    assert (applied, errors) == (1, [])
+    assert conn.execute("SELECT Quantity FROM food_listings WHERE Food_ID = 2").fetchone()[0] == 7
+
+
+def test_boolean_is_rejected(conn):
+    applied, errors, _ = apply(conn, "delete", jsonl({"Food_ID": True}))
+    assert applied == 0
+    assert errors[0][1].startswith("Food_ID:")
+    assert conn.execute("SELECT COUNT(*) FROM food_listings").fetchone()[0] == 2
@@ -0,0 +1,38 @@
+import logging
+import sqlite3
+
+from migrations import SCHEMA_VERSION, migrate, schema_version
+
+
+def legacy_database(path):
+    """The tables as the notebook created them: every column TEXT, US-style dates."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE providers (Provider_ID TEXT, Name TEXT, Type TEXT, Address TEXT, City TEXT, Contact TEXT);
+        CREATE TABLE receivers (Receiver_ID TEXT, Name TEXT, Type TEXT, City TEXT, Contact TEXT);
+        CREATE TABLE food_listings (Food_ID TEXT, Food_Name TEXT, Quantity TEXT, Expiry_Date TEXT,
+                                    Provider_ID TEXT, Provider_Type TEXT, Location TEXT, Food_Type TEXT,
+                                    Meal_Type TEXT);
+        CREATE TABLE claims (Claim_ID TEXT, Food_ID TEXT, Receiver_ID TEXT, Status TEXT, Timestamp TEXT);
+        INSERT INTO providers VALUES ('1', 'Provider', 'Restaurant', 'Street 1', 'Springfield', '555');
+        INSERT INTO receivers VALUES ('1', 'Receiver', 'NGO', 'Springfield', '555');
+        INSERT INTO food_listings VALUES ('1', 'Bread', '5', '3/17/2025', '1', 'Restaurant', 'Springfield',
+                                          'Vegan', 'Lunch');
+        INSERT INTO food_listings VALUES ('2', 'Rice', '5', '13/45/2025', '1', 'Restaurant', 'Springfield',
+                                          'Vegan', 'Dinner');
+        INSERT INTO claims VALUES ('1', '1', '1', 'Pending', '3/5/2025 5:26');
+    """)
+    conn.commit()
+    return conn
+
+
+def test_malformed_expiry_date_does_not_stop_migration(tmp_path, caplog):
+    conn = legacy_database(tmp_path / "food.db")
+    with caplog.at_level(logging.WARNING, logger="migrations"):
+        migrate(conn)
+
+    assert schema_version(conn) == SCHEMA_VERSION
+    dates = dict(conn.execute("SELECT Food_ID, Expiry_Date FROM food_listings"))
+    assert dates == {1: "2025-03-17", 2: "13/45/2025"}
+    assert conn.execute("SELECT Timestamp FROM claims").fetchone()[0] == "2025-03-05 05:26:00"
+    assert "food_listings.Expiry_Date: 1 values are not dates" in caplog.text
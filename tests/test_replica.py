@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+import time
+from functools import partial
+
+import pytest
+
+import replica
+from db import connect_reader, connect_writer
+
+COPY_SECONDS = 0.5
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "food.db")
+    conn = connect_writer(path)
+    conn.execute("CREATE TABLE claims (Claim_ID INTEGER PRIMARY KEY, Status TEXT)")
+    conn.executemany("INSERT INTO claims (Status) VALUES (?)", [("Pending",)] * 1000)
+    conn.commit()
+    yield path, conn
+    conn.close()
+
+
+@pytest.fixture
+def slow_copies(monkeypatch):
+    """Make every copy take COPY_SECONDS, and signal when one has started."""
+    started = threading.Event()
+    generation = replica._Generation
+
+    class SlowGeneration(generation):
+        def __init__(self, source, data_version):
+            started.set()
+            time.sleep(COPY_SECONDS)
+            super().__init__(source, data_version)
+
+    monkeypatch.setattr(replica, "_Generation", SlowGeneration)
+    return started
+
+
+def wait_for_refresh(hot, refreshes, timeout=10):
+    deadline = time.monotonic() + timeout
+    while hot.refreshes < refreshes and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_reader_does_not_wait_for_a_copy(database, slow_copies):
+    path, writer = database
+    hot = replica.HotReplica(partial(connect_reader, path))
+    assert hot.reader() is not None
+    slow_copies.clear()
+
+    writer.execute("UPDATE claims SET Status = 'Completed' WHERE Claim_ID = 1")
+    writer.commit()
+    assert hot.reader() is None  # stale: starts a refresh and reads from disk
+    assert slow_copies.wait(5)
+
+    start = time.perf_counter()
+    assert hot.reader() is None
+    assert time.perf_counter() - start < COPY_SECONDS / 5
+
+
+def test_one_write_causes_one_refresh(database, slow_copies):
+    path, writer = database
+    hot = replica.HotReplica(partial(connect_reader, path))
+    assert hot.refreshes == 1
+
+    writer.execute("UPDATE claims SET Status = 'Completed' WHERE Claim_ID = 1")
+    writer.commit()
+    readers = [threading.Thread(target=lambda: [hot.reader() for _ in range(50)]) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+    wait_for_refresh(hot, 2)
+    for _ in range(20):  # readers after the swap must not start another copy
+        conn = hot.reader()
+    time.sleep(COPY_SECONDS / 5)
+
+    assert hot.refreshes == 2
+    assert conn.execute("SELECT Status FROM claims WHERE Claim_ID = 1").fetchone()[0] == "Completed"
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import reports
+import snapshots
+import versions
+from migrations import migrate
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "food.db")
+    migrate(conn)
+    conn.executemany("INSERT INTO providers (Provider_ID, Name) VALUES (?, ?)",
+                     [(1, "Bakery"), (2, "Market"), (3, None)])
+    conn.executemany("INSERT INTO receivers (Receiver_ID, Name) VALUES (?, ?)", [(1, "Shelter"), (2, "Pantry")])
+    conn.executemany(
+        """INSERT INTO food_listings (Food_ID, Food_Name, Quantity, Provider_ID, Location)
+           VALUES (?, 'Bread', ?, ?, ?)""",
+        [(1, 5, 1, "Pune"), (2, 5, 2, "Delhi"), (3, None, 3, None), (4, 8, 1, "Pune")])
+    conn.executemany(
+        "INSERT INTO claims (Claim_ID, Food_ID, Receiver_ID, Status, Timestamp) VALUES (?, ?, ?, 'Pending', ?)",
+        [(1, 1, 1, "2025-03-01 10:00:00"), (2, 2, 2, "2025-03-01 11:00:00"),
+         (3, 3, 2, None), (4, 4, 1, "2025-03-03 09:30:00")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_snapshot_reports_match_sql(conn, tmp_path):
+    snapshots.export(conn, tmp_path / "snapshots")
+    cache = reports.ReportCache(snapshot_root=tmp_path / "snapshots")
+    for report_id in reports.SNAPSHOT_REPORTS:
+        title = reports.REPORT_IDS[report_id]
+        expected = pd.read_sql_query(reports.SQL_QUERIES[title], conn)
+        pd.testing.assert_frame_equal(cache.get(conn, title), expected)
+    assert cache.snapshot_builds == len(reports.SNAPSHOT_REPORTS)
+
+
+def test_stale_snapshot_falls_back_to_sql(conn, tmp_path):
+    snapshots.export(conn, tmp_path / "snapshots")
+    conn.execute("INSERT INTO claims (Food_ID, Receiver_ID, Timestamp) VALUES (2, 1, '2025-03-04')")
+    versions.bump(conn, ["claims"])
+    conn.commit()
+    cache = reports.ReportCache(snapshot_root=tmp_path / "snapshots")
+
+    by_city = cache.get(conn, reports.REPORT_IDS["19"])
+    assert dict(zip(by_city.City, by_city.Total_Claims))["Delhi"] == 2
+    assert cache.snapshot_builds == 0
+    cache.get(conn, reports.REPORT_IDS["24"])  # reads no claims, so the snapshot still serves it
+    assert cache.snapshot_builds == 1
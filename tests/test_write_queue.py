@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+
+import versions
+from migrations import migrate
+from write_queue import WriteQueue
+
+WRITERS = 8
+
+
+def test_concurrent_submissions_share_one_commit(tmp_path):
+    conn = sqlite3.connect(tmp_path / "food.db", check_same_thread=False)
+    migrate(conn)
+    writes = WriteQueue(conn, max_wait=0.05)
+    start = threading.Barrier(WRITERS)
+    futures = [None] * WRITERS
+
+    def submit(i):
+        start.wait()
+        futures[i] = writes.execute(("providers",), "INSERT INTO providers (Provider_ID, Name) VALUES (?, ?)",
+                                    (i, f"Provider {i}"))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [f.result(timeout=5) for f in futures] == [1] * WRITERS
+    writes.close()
+
+    assert (writes.groups, writes.operations) == (1, WRITERS)
+    assert versions.current(conn, ("providers",)) == {"providers": 1}  # bumped by the one transaction
+    assert conn.execute("SELECT COUNT(*) FROM providers").fetchone()[0] == WRITERS
+    conn.close()
@@ -0,0 +1,73 @@
+"""Per-table change counters.
+
+Every code path that writes to one of the data tables bumps its counter in
+`table_versions`. Anything cached from those tables (reports, charts, option
+lists) keys on the counters it read, so a write only invalidates what
+actually depends on the touched table.
+"""
+import threading
+from collections import OrderedDict
+
+DATA_TABLES = ("providers", "receivers", "food_listings", "claims")
+
+
+def bump(conn, tables):
+    """Increment the counters for `tables`; runs inside the caller's transaction."""
+    conn.executemany(
+        """INSERT INTO table_versions (table_name, version) VALUES (?, 1)
+           ON CONFLICT (table_name) DO UPDATE SET version = version + 1""",
+        [(t,) for t in tables],
+    )
+
+
+def current(conn, tables=DATA_TABLES):
+    """Return {table: version} for `tables` (missing tables read as 0)."""
+    placeholders = ", ".join("?" * len(tables))
+    rows = conn.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        list(tables),
+    ).fetchall()
+    versions = dict.fromkeys(tables, 0)
+    versions.update(rows)
+    return versions
+
+
+class VersionedCache:
+    """Size-bounded LRU whose entries are valid while their tables are unchanged.
+
+    Each entry remembers the versions of the tables it was built from; a
+    lookup re-reads those counters and rebuilds the entry if any moved.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (versions, value)
+        self._lock = threading.Lock()
+
+    def get(self, conn, key, tables, build, extra=()):
+        """Return the cached value for `key`, calling build(conn) when stale.
+
+        `extra` is folded into the version stamp for entries that also
+        depend on something outside the database (e.g. today's date).
+        """
+        stamp = tuple(current(conn, tables).values()) + tuple(extra)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = build(conn)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
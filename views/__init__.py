@@ -0,0 +1,30 @@
+"""Page registry for seema.py.
+
+Each page lives in its own module with a `render()` function, imported the
+first time the page is shown. A rerun therefore executes only the active
+page, and a static page never loads pandas or opens the database. (The
+package is not called `pages/` because Streamlit turns that directory into
+its own multipage navigation.)
+"""
+from importlib import import_module
+
+# sidebar label -> module under views/, in sidebar order
+PAGES = {
+    "🏠 Home": "home",
+    "📊 Data Overview": "overview",
+    "🔍 Filter & Search": "filter_search",
+    "📈 Analytics & Insights": "insights",
+    "🧮 SQL Query Results": "sql_reports",
+    "🛠️ CRUD Operations": "crud",
+    "ℹ️ About Creator": "about",
+}
+
+# Reachable only with ?admin=1
+ADMIN_PAGES = {
+    "🩺 Profiler": "profiler_page",
+}
+
+
+def render(label):
+    module = PAGES.get(label) or ADMIN_PAGES[label]
+    import_module(f"{__name__}.{module}").render()
@@ -0,0 +1,20 @@
+"""About Creator: static page."""
+import streamlit as st
+
+
+def render():
+    st.title("ℹ️ About the Creator")
+    
+    st.markdown("""
+**👤 Name:** KUKKAR SEEMA BALASAHEB  
+**📧 Email:** kukkarkunal07@gmail.com  
+**🌐 LinkedIn:** [Visit Profile](https://www.linkedin.com/in/seema-kukkar-61a51a337?utm_source=share&utm_campaign=share_via&utm_content=profile&utm_medium=android_app)
+    """)
+
+   
+    st.markdown("""
+### 🙏 Thank You for Visiting!  
+This project was created to connect surplus food providers with those in need,  
+aiming to **reduce food wastage** and promote **social good**.
+    """)
+
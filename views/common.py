@@ -0,0 +1,92 @@
+"""Widgets shared by the data pages."""
+import csv
+import io
+import math
+
+import streamlit as st
+
+from filters import PAGE_SIZE, count_rows, fetch_page, table_count
+from migrations import TABLE_COLUMNS
+from views.resources import get_cache, get_pool
+import batch
+import export
+import search
+
+WRITE_TIMEOUT_SECONDS = 30
+
+
+def show_page(table, order_by, where, params, key, empty_message, search_text=""):
+    """Show one page of a filtered table; only that page is read from SQLite.
+
+    With `search_text` the rows come from the table's full-text index,
+    best match first.
+    """
+    conn = get_pool().reader()
+    expression = search.match_expression(conn, table, search_text) if search_text else None
+    if expression:
+        total = search.count_matches(conn, table, expression, where, params)
+    elif where:
+        total = count_rows(conn, table, where, params)
+    else:
+        total = table_count(get_cache(), conn, table)
+    if total == 0:
+        st.warning(empty_message)
+        return
+    pages = math.ceil(total / PAGE_SIZE)
+    page = min(st.number_input("Page", min_value=1, step=1, key=key), pages)
+    st.caption(f"Page {page} of {pages} · {total} matching rows")
+    if expression:
+        st.dataframe(search.fetch_matches(conn, table, expression, where, params, page))
+    else:
+        st.dataframe(fetch_page(conn, table, order_by, where, params, page))
+    show_export(table, *export.table_query(table, where, params, expression), key=f"{key}_export")
+
+
+def show_export(name, sql, params, key):
+    """Format picker and a download button that streams every row of `sql` when clicked.
+
+    Rows go from the cursor straight into the encoder a chunk at a time;
+    nothing runs until the button is pressed.
+    """
+    col1, col2, col3 = st.columns([2, 1, 2], vertical_alignment="bottom")
+    fmt = col1.selectbox("Export format", list(export.FORMATS), key=f"{key}_format")
+    compress = col2.checkbox("gzip", key=f"{key}_gzip")
+    pool = get_pool()
+
+    def build():  # runs on a download thread, so it reads through that thread's connection
+        f = io.BytesIO()
+        export.write(f, export.encode(pool.reader(), sql, params, fmt, compress))
+        return f
+
+    col3.download_button("⬇️ Export all rows", build, file_name=export.file_name(name, fmt, compress),
+                         mime=export.mime_type(fmt, compress), key=key, on_click="ignore")
+
+
+def write(table, sql, params=()):
+    """Queue one statement for the single writer and wait until its group commits."""
+    return get_pool().writes.execute((table,), sql, params).result(timeout=WRITE_TIMEOUT_SECONDS)
+
+
+def show_batch_upload(table, label):
+    """Apply an uploaded CSV/JSONL file to `table` in chunks and list the rejected rows."""
+    st.subheader(f"📥 Batch Upload {label}")
+    operation = st.radio("Batch operation", batch.OPERATIONS, horizontal=True, key=f"{table}_batch_operation")
+    st.caption(f"Columns: {', '.join(TABLE_COLUMNS[table])}. Updates and deletes need "
+               f"{batch.PRIMARY_KEYS[table]}; blank cells in an update leave the column unchanged.")
+    upload = st.file_uploader("CSV or JSONL file", type=["csv", "jsonl"], key=f"{table}_batch_file")
+    if upload is not None and st.button("Apply Batch"):
+        fmt = "jsonl" if upload.name.endswith(".jsonl") else "csv"
+        pool = get_pool()
+        try:
+            applied, errors, seconds = batch.apply_batch(lambda: pool.writer(table), table, operation, upload, fmt)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        st.success(f"✅ {applied} rows applied in {seconds:.2f}s")
+        if errors:
+            st.warning(f"{len(errors)} rows rejected")
+            st.dataframe([{"line": line, "error": error} for line, error in errors])
+            report = io.StringIO()
+            csv.writer(report).writerows([("line", "error"), *errors])
+            st.download_button("Download error report", report.getvalue(),
+                               file_name=f"{table}_{operation}_errors.csv", mime="text/csv")
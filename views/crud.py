@@ -0,0 +1,185 @@
+"""CRUD Operations: single-record forms and batch uploads."""
+from datetime import date, datetime
+
+import streamlit as st
+
+from dates import to_iso_date, to_iso_timestamp
+from views.common import show_batch_upload, write
+
+
+def render():
+    st.title("🛠️ Manage Records")
+
+    table_choice = st.selectbox("Select Table", ["Food Listings","Providers","Receivers", "Claims"])
+
+    # ================= FOOD LISTINGS =================
+    if table_choice == "Food Listings":
+        crud_operation = st.selectbox("Choose Operation", ["Add Record", "Update Record", "Delete Record", "Batch Upload"])
+
+        # ADD
+        if crud_operation == "Add Record":
+            st.subheader("➕ Add New Food Listing")
+            food_name = st.text_input("Food Name")
+            quantity = st.number_input("Quantity", min_value=1)
+            expiry = st.date_input("Expiry Date")
+            provider_id = st.number_input("Provider ID", min_value=1)
+            provider_type = st.text_input("Provider Type")
+            location = st.text_input("Location")
+            food_type = st.text_input("Food Type")
+            meal_type = st.text_input("Meal Type")
+            if st.button("Add Food"):
+                write("food_listings", """
+                    INSERT INTO food_listings 
+                    (Food_Name, Quantity, Expiry_Date, Provider_ID, Provider_Type, Location, Food_Type, Meal_Type) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (food_name, quantity, to_iso_date(expiry), provider_id, provider_type, location, food_type, meal_type))
+                st.success(f"✅ Food '{food_name}' added successfully!")
+
+        # UPDATE
+        elif crud_operation == "Update Record":
+            st.subheader("✏️ Update Food Listing")
+            food_id = st.number_input("Enter Food ID to Update", min_value=1, step=1)
+            quantity = st.number_input("New Quantity", min_value=1)
+            expiry = st.date_input("New Expiry Date", min_value=date.today())
+            if st.button("Update Food"):
+                write("food_listings", """
+                    UPDATE food_listings 
+                    SET Quantity = ?, Expiry_Date = ? 
+                    WHERE Food_ID = ?
+                """, (quantity, to_iso_date(expiry), food_id))
+                st.success(f"✅ Food ID {food_id} updated successfully!")
+
+        # DELETE
+        elif crud_operation == "Delete Record":
+            st.subheader("🗑️ Delete Food Listing")
+            food_id = st.number_input("Enter Food ID to Delete", min_value=1, step=1)
+            if st.button("Delete Food"):
+                write("food_listings", "DELETE FROM food_listings WHERE Food_ID = ?", (food_id,))
+                st.success(f"✅ Food ID {food_id} deleted successfully!")
+
+        # BATCH
+        elif crud_operation == "Batch Upload":
+            show_batch_upload("food_listings", "Food Listings")
+
+    # ================= PROVIDERS =================
+    elif table_choice == "Providers":
+        crud_operation = st.selectbox("Choose Operation", ["Add Record", "Update Record", "Delete Record"])
+
+        # ADD
+        if crud_operation == "Add Record":
+            st.subheader("➕ Add New Provider")
+            name = st.text_input("Provider Name")
+            provider_type = st.text_input("Provider Type")
+            contact = st.text_input("Contact")
+            location = st.text_input("Location")
+            if st.button("Add Provider"):
+                write("providers", """
+                    INSERT INTO providers (Name, Type, Contact, City) 
+                    VALUES (?, ?, ?, ?)
+                """, (name, provider_type, contact, location))
+                st.success(f"✅ Provider '{name}' added successfully!")
+
+        # UPDATE
+        elif crud_operation == "Update Record":
+            st.subheader("✏️ Update Provider")
+            provider_id = st.number_input("Enter Provider ID to Update", min_value=1, step=1)
+            name = st.text_input("New Name")
+            contact = st.text_input("New Contact")
+            if st.button("Update Provider"):
+                write("providers", """
+                    UPDATE providers 
+                    SET Name = ?, Contact = ? 
+                    WHERE Provider_ID = ?
+                """, (name, contact, provider_id))
+                st.success(f"✅ Provider ID {provider_id} updated successfully!")
+
+        # DELETE
+        elif crud_operation == "Delete Record":
+            st.subheader("🗑️ Delete Provider")
+            provider_id = st.number_input("Enter Provider ID to Delete", min_value=1, step=1)
+            if st.button("Delete Provider"):
+                write("providers", "DELETE FROM providers WHERE Provider_ID = ?", (provider_id,))
+                st.success(f"✅ Provider ID {provider_id} deleted successfully!")
+
+    # ================= RECEIVERS =================
+    elif table_choice == "Receivers":
+        crud_operation = st.selectbox("Choose Operation", ["Add Record", "Update Record", "Delete Record"])
+
+        # ADD
+        if crud_operation == "Add Record":
+            st.subheader("➕ Add New Receiver")
+            name = st.text_input("Receiver Name")
+            receiver_type = st.text_input("Receiver Type")
+            contact = st.text_input("Contact")
+            location = st.text_input("Location")
+            if st.button("Add Receiver"):
+                write("receivers", """
+                    INSERT INTO receivers (Name, Type, Contact, City) 
+                    VALUES (?, ?, ?, ?)
+                """, (name, receiver_type, contact, location))
+                st.success(f"✅ Receiver '{name}' added successfully!")
+
+        # UPDATE
+        elif crud_operation == "Update Record":
+            st.subheader("✏️ Update Receiver")
+            receiver_id = st.number_input("Enter Receiver ID to Update", min_value=1, step=1)
+            name = st.text_input("New Name")
+            contact = st.text_input("New Contact")
+            if st.button("Update Receiver"):
+                write("receivers", """
+                    UPDATE receivers 
+                    SET Name = ?, Contact = ? 
+                    WHERE Receiver_ID = ?
+                """, (name, contact, receiver_id))
+                st.success(f"✅ Receiver ID {receiver_id} updated successfully!")
+
+        # DELETE
+        elif crud_operation == "Delete Record":
+            st.subheader("🗑️ Delete Receiver")
+            receiver_id = st.number_input("Enter Receiver ID to Delete", min_value=1, step=1)
+            if st.button("Delete Receiver"):
+                write("receivers", "DELETE FROM receivers WHERE Receiver_ID = ?", (receiver_id,))
+                st.success(f"✅ Receiver ID {receiver_id} deleted successfully!")
+
+    # ================= CLAIMS =================
+    elif table_choice == "Claims":
+        crud_operation = st.selectbox("Choose Operation", ["Add Record", "Update Record", "Delete Record", "Batch Upload"])
+
+        # ADD
+        if crud_operation == "Add Record":
+            st.subheader("➕ Add New Claim")
+            food_id = st.number_input("Food ID", min_value=1)
+            receiver_id = st.number_input("Receiver ID", min_value=1)
+            claim_date = st.date_input("Claim Date", min_value=date.today())
+            status = st.text_input("Status")
+            if st.button("Add Claim"):
+                write("claims", """
+                    INSERT INTO claims (Food_ID, Receiver_ID, Timestamp, Status) 
+                    VALUES (?, ?, ?, ?)
+                """, (food_id, receiver_id, to_iso_timestamp(datetime.combine(claim_date, datetime.now().time())), status))
+                st.success("✅ Claim added successfully!")
+
+        # UPDATE
+        elif crud_operation == "Update Record":
+            st.subheader("✏️ Update Claim")
+            claim_id = st.number_input("Enter Claim ID to Update", min_value=1, step=1)
+            status = st.text_input("New Status")
+            if st.button("Update Claim"):
+                write("claims", """
+                    UPDATE claims 
+                    SET Status = ? 
+                    WHERE Claim_ID = ?
+                """, (status, claim_id))
+                st.success(f"✅ Claim ID {claim_id} updated successfully!")
+
+        # DELETE
+        elif crud_operation == "Delete Record":
+            st.subheader("🗑️ Delete Claim")
+            claim_id = st.number_input("Enter Claim ID to Delete", min_value=1, step=1)
+            if st.button("Delete Claim"):
+                write("claims", "DELETE FROM claims WHERE Claim_ID = ?", (claim_id,))
+                st.success(f"✅ Claim ID {claim_id} deleted successfully!")
+
+        # BATCH
+        elif crud_operation == "Batch Upload":
+            show_batch_upload("claims", "Claims")
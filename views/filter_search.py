@@ -0,0 +1,73 @@
+"""Filter & Search: filtered, paginated views of the four tables."""
+import streamlit as st
+
+from filters import ALL, build_where, option_values, parse_id
+from views.common import show_page
+from views.resources import get_cache, get_pool
+
+
+def render():
+    conn = get_pool().reader()
+    cache = get_cache()
+    st.header("🔎 Filter and Search Food Listings")
+
+    st.subheader("🏢 Providers")
+    col1, col2 = st.columns(2)
+    name_filter = col1.text_input("Search Providers (name, address, city)")
+    provider_id_text = col2.text_input("Provider_ID")
+    try:
+        provider_id = parse_id(provider_id_text)
+    except ValueError:
+        st.warning("Provider_ID must be a number.")
+        provider_id = None
+    where, params = build_where(equals={"Provider_ID": provider_id})
+    show_page("providers", "Provider_ID", where, params, key="providers_page",
+              empty_message="No providers data found.", search_text=name_filter)
+
+    # -------- Receivers Table --------
+    st.subheader("🤝 Receivers")
+    col1, col2 = st.columns(2)
+    name_filter = col1.text_input("Search Receivers (name, city)")
+    city_filter = col2.selectbox("City", [ALL] + option_values(cache, conn, "receivers", "City"),
+                                 key="receivers_city")
+    where, params = build_where(equals={"City": city_filter})
+    show_page("receivers", "Receiver_ID", where, params, key="receivers_page",
+              empty_message="No receivers data found.", search_text=name_filter)
+
+    # -------- Food Listings Table --------
+    st.subheader("🍲 Food Listings")
+    food_search = st.text_input("Search Food Listings (food name, location)")
+    col1, col2, col3, col4 = st.columns(4)
+    city_filter = col1.selectbox("City", [ALL] + option_values(cache, conn, "food_listings", "Location"),
+                                 key="food_listings_city")
+    provider_type_filter = col2.selectbox("Provider Type", [ALL] + option_values(cache, conn, "food_listings", "Provider_Type"))
+    food_type_filter = col3.selectbox("Food Type", [ALL] + option_values(cache, conn, "food_listings", "Food_Type"))
+    meal_type_filter = col4.selectbox("Meal Type", [ALL] + option_values(cache, conn, "food_listings", "Meal_Type"))
+    where, params = build_where(equals={
+        "Location": city_filter,
+        "Provider_Type": provider_type_filter,
+        "Food_Type": food_type_filter,
+        "Meal_Type": meal_type_filter,
+    })
+    show_page("food_listings", "Food_ID", where, params, key="food_listings_page",
+              empty_message="No food listings data found.", search_text=food_search)
+
+    # -------- Claims Table --------
+    st.subheader("📦 Claims")
+    col1, col2, col3 = st.columns(3)
+    receiver_filter = col1.text_input("Search by Receiver ID")
+    food_filter = col2.text_input("Search by Food ID")
+    status_filter = col3.selectbox("Filter by Status", [ALL] + option_values(cache, conn, "claims", "Status"))
+    try:
+        receiver_id = parse_id(receiver_filter)
+        food_id = parse_id(food_filter)
+    except ValueError:
+        st.warning("Receiver ID and Food ID must be numbers.")
+        receiver_id = food_id = None
+    where, params = build_where(equals={
+        "Status": status_filter,
+        "Receiver_ID": receiver_id,
+        "Food_ID": food_id,
+    })
+    show_page("claims", "Claim_ID", where, params, key="claims_page",
+              empty_message="No claims data found.")
@@ -0,0 +1,20 @@
+"""Home: static landing page."""
+import streamlit as st
+
+
+def render():
+    st.title("Local Food Wastage Management System")
+    st.image(r"c:\Users\91997\Downloads\download.jfif")
+    st.subheader("Connecting surplus food providers with those in need")
+    st.markdown("""
+    **Project Goals:**
+    - Reduce food wastage locally
+    - Enable NGOs and individuals to access surplus food
+    - Provide insights for food redistribution
+    
+    **Skills Applied:**  
+    `Python` | `SQL` | `Streamlit` | `Data Analysis`
+
+    **Domain:**  
+    Food Management | Waste Reduction | Social Good
+    """)
@@ -0,0 +1,40 @@
+"""Analytics & Insights: cached Plotly charts."""
+import streamlit as st
+
+from charts import chart_spec, forecast_chart
+from views.resources import get_cache, get_pool
+
+
+def render():
+    conn = get_pool().reader()
+    st.header("📊 Data Analysis & Insights")
+    try:
+        # 1. Most Claimed Meal Type
+        st.subheader("1️⃣ Most Claimed Meal Type")
+        st.plotly_chart(chart_spec(get_cache(), conn, "meal_type_claims"))
+
+        # 2. Top Food Donating Providers
+        st.subheader("2️⃣ Top Food Donating Providers")
+        st.plotly_chart(chart_spec(get_cache(), conn, "top_providers"))
+
+        # 3. Claim demand forecast
+        st.subheader("3️⃣ Claim Demand Forecast")
+        show_forecast(conn)
+
+    except Exception as e:
+        st.error(f"❌ Error: {e}")
+
+
+def show_forecast(conn):
+    import forecast  # scikit-learn is only loaded once the forecast is shown
+
+    updating = forecast.pending(conn)
+    if updating:  # trains off the page; this run shows the stored predictions
+        forecast.start_update(get_pool())
+        st.caption("⏳ The forecast is updating in the background; it refreshes on a later run.")
+    cities = forecast.forecast_cities(get_cache(), conn)
+    if not cities:
+        st.info("The forecast is being trained." if updating else "Not enough claim history for a forecast yet.")
+        return
+    city = st.selectbox("City", cities, key="forecast_city")
+    st.plotly_chart(forecast_chart(forecast.city_forecast(get_cache(), conn, city), city))
@@ -0,0 +1,21 @@
+"""Data Overview: one page of the selected table."""
+import streamlit as st
+
+from views.common import show_page
+
+OVERVIEW_TABLES = {
+    "Providers": ("providers", "Provider_ID"),
+    "Receivers": ("receivers", "Receiver_ID"),
+    "Food Listings": ("food_listings", "Food_ID"),
+    "Claims": ("claims", "Claim_ID"),
+}
+
+
+def render():
+    st.header("📂 Dataset Overview")
+    # Only the selected table is queried; st.tabs would run every tab on each rerun
+    table_label = st.radio("Table", list(OVERVIEW_TABLES), horizontal=True)
+    table, order_by = OVERVIEW_TABLES[table_label]
+    st.subheader(f"{table_label} Data")
+    show_page(table, order_by, "", [], key=f"overview_{table}_page",
+              empty_message=f"No {table_label.lower()} data found.")
@@ -0,0 +1,32 @@
+"""Profiler: query and rerun statistics (admin only)."""
+import streamlit as st
+
+from views.resources import get_pool, get_profiler
+
+
+def render():
+    profiler = get_profiler()
+    st.header("🩺 Query Profiler")
+    st.caption(f"Queries slower than {profiler.slow_ms} ms are counted as slow; "
+               "the full log is in logs/profile.jsonl.")
+    if st.button("Reset statistics"):
+        profiler.reset()
+
+    st.subheader("Rerun time per page")
+    st.dataframe(profiler.page_stats())
+
+    st.subheader("Statements by total time")
+    only_scans = st.checkbox("Only statements with full table scans")
+    stats = profiler.query_stats()
+    if only_scans:
+        stats = [row for row in stats if row["full_scan"]]
+    st.dataframe([{**row, "full_scan": ", ".join(row["full_scan"]), "plan": " | ".join(row["plan"])}
+                  for row in stats])
+
+    st.subheader("Recent reruns")
+    st.dataframe(list(reversed(profiler.recent_reruns)))
+
+    replica = get_pool().replica
+    if replica is not None:
+        st.subheader("In-memory replica")
+        st.json(replica.stats())
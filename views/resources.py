@@ -0,0 +1,41 @@
+"""Process-wide resources shared by every session and page.
+
+Each getter is an st.cache_resource, so the object is built once per process,
+on first use. The imports live inside the getters: the database layer pulls
+in pandas through its helpers, and static pages never need it.
+"""
+import os
+
+import streamlit as st
+
+# FOOD_DATA_REPLICA_MB=512 serves reads from an in-memory copy of the
+# database while two copies of it fit in that many MiB (see replica.py); 0
+# reads from disk
+REPLICA_MB = int(os.environ.get("FOOD_DATA_REPLICA_MB", "0"))
+
+
+# Query and rerun timings, shown on the admin page (?admin=1)
+@st.cache_resource
+def get_profiler():
+    from profiler import Profiler
+    return Profiler()
+
+
+# Database connections: one pool per process, shared by all sessions
+@st.cache_resource
+def get_pool():
+    from db import DB_PATH, ConnectionPool
+    return ConnectionPool(DB_PATH, profiler=get_profiler(), replica_budget=REPLICA_MB * 2**20)
+
+
+@st.cache_resource
+def get_report_cache():
+    from reports import ReportCache
+    return ReportCache()
+
+
+# Small derived values (chart specs, table row counts) keyed on table versions
+@st.cache_resource
+def get_cache():
+    from versions import VersionedCache
+    return VersionedCache(max_entries=32)
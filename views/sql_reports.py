@@ -0,0 +1,18 @@
+"""SQL Query Results: the canned reports."""
+import streamlit as st
+
+import export
+from reports import SQL_QUERIES
+from views.common import show_export
+from views.resources import get_pool, get_report_cache
+
+
+def render():
+    conn = get_pool().reader()
+    st.header("🧾 SQL Query-Based Reports")
+
+    query_choice = st.selectbox("Select a query to run:", list(SQL_QUERIES.keys()))
+    df = get_report_cache().get(conn, query_choice)
+    st.dataframe(df)
+    report_id = query_choice.split(".")[0]
+    show_export(f"report_{report_id}", *export.report_query(query_choice), key="report_export")
@@ -0,0 +1,119 @@
+"""Single-writer queue with group commit.
+
+Sessions submit mutations instead of writing themselves. One background
+thread owns the writer connection, takes whatever has queued up (up to
+MAX_BATCH operations, waiting up to `max_wait` seconds for more to arrive)
+and applies it in a single transaction. Each operation runs inside its own
+SAVEPOINT, so a failing operation is rolled back and reported through its
+future without undoing the others. The group pays for one commit and one WAL
+sync, and holds SQLite's write lock once, however many coordinators
+submitted at the same moment.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import versions
+
+MAX_BATCH = 256
+# A lone write waits this long for company before committing. Sessions that
+# click at the same moment rarely submit within the same microsecond, so
+# without a window each would pay its own commit.
+MAX_WAIT_SECONDS = 0.002
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Applies submitted operations on `conn` from a dedicated thread.
+
+    `lock` is held while a group is applied, so code that uses the same
+    connection directly (ConnectionPool.writer) is serialized with it.
+    """
+
+    def __init__(self, conn, lock=None, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SECONDS):
+        self.conn = conn
+        self.lock = lock or threading.Lock()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.groups = 0
+        self.operations = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, tables, fn):
+        """Queue `fn(conn)` as a write to `tables`; returns a Future of its return value."""
+        future = Future()
+        self._queue.put((tuple(tables), fn, future))
+        return future
+
+    def execute(self, tables, sql, params=()):
+        """Queue one statement; the Future resolves to the number of rows it changed."""
+        return self.submit(tables, lambda conn: conn.execute(sql, params).rowcount)
+
+    def close(self, timeout=None):
+        """Apply what is already queued, then stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self, first):
+        group = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(group) < self.max_batch and first is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            group.append(item)
+            if item is _STOP:
+                break
+        return group
+
+    def _run(self):
+        while True:
+            group = self._collect(self._queue.get())
+            stop = group[-1] is _STOP
+            if stop:
+                group.pop()
+            if group:
+                self._apply(group)
+            if stop:
+                return
+
+    def _apply(self, group):
+        done = []
+        with self.lock:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                for tables, fn, future in group:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    self.conn.execute("SAVEPOINT queued_write")
+                    try:
+                        result = fn(self.conn)
+                    except Exception as e:
+                        self.conn.execute("ROLLBACK TO queued_write")
+                        self.conn.execute("RELEASE queued_write")
+                        future.set_exception(e)
+                        continue
+                    self.conn.execute("RELEASE queued_write")
+                    done.append((tables, future, result))
+                touched = sorted({t for tables, _, _ in done for t in tables})
+                if touched:
+                    versions.bump(self.conn, touched)
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                for _, _, future in group:
+                    if future.done():
+                        continue  # cancelled, or its own operation already failed
+                    if future.running() or future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+                return
+        self.groups += 1
+        self.operations += len(done)
+        for _, future, result in done:
+            future.set_result(result)